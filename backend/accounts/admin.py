@@ -1,14 +1,21 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.shortcuts import redirect
+
+from core.admin import person_leads_url
+from core.admin_mixins import DateRangeFilter, LargeTableAdminMixin
+from core.identity import identity_of
+
 from .models import User
 
 
 @admin.register(User)
-class UserAdmin(BaseUserAdmin):
+class UserAdmin(LargeTableAdminMixin, BaseUserAdmin):
     list_display = ["email", "first_name", "is_investor", "is_staff", "created_at"]
-    list_filter = ["is_staff", "is_investor", "is_active"]
+    list_filter = ["is_staff", "is_investor", "is_active", ("created_at", DateRangeFilter)]
     search_fields = ["email", "first_name", "last_name"]
-    ordering = ["-created_at"]
+    ordering = ["-created_at", "-pk"]
+    actions = ["contact_requests"]
     
     fieldsets = (
         (None, {"fields": ("email", "password")}),
@@ -22,4 +29,13 @@ class UserAdmin(BaseUserAdmin):
             "classes": ("wide",),
             "fields": ("email", "first_name", "password1", "password2"),
         }),
-    )
\ No newline at end of file
+    )
+
+    @admin.action(description="Заявки этих пользователей")
+    def contact_requests(self, request, queryset):
+        identities = [identity_of(user) for user in queryset.only("phone", "email", "telegram")]
+        return redirect(person_leads_url(
+            [identity["phone"] for identity in identities],
+            [identity["email"] for identity in identities],
+            [identity["telegram"] for identity in identities],
+        ))
@@ -28,7 +28,7 @@ class User(AbstractUser):
     
     is_investor = models.BooleanField("Инвестор", default=False)
     
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     objects = UserManager()
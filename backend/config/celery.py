@@ -63,11 +63,29 @@ app.conf.beat_schedule = {
         "schedule": crontab(minute=0, hour=3, day_of_week=0),
     },
 
+    # Каждые 5 минут - уведомления о заявках, которые не ушли сразу
+    "dispatch-lead-notifications": {
+        "task": "core.tasks.dispatch_lead_notifications",
+        "schedule": crontab(minute="*/5"),
+    },
+
+    # Ежедневно в 4:00 - обложки YouTube, которые не скачались сразу
+    "mirror-youtube-posters": {
+        "task": "core.tasks.mirror_youtube_posters",
+        "schedule": crontab(minute=0, hour=4),
+    },
+
     # Каждые 30 минут - очистка неподтверждённых аккаунтов
     "cleanup-unverified-accounts": {
         "task": "core.tasks.cleanup_unverified_accounts",
         "schedule": crontab(minute="*/30"),
     },
+
+    # Каждую минуту - статусы мероприятий (начались / закончились)
+    "advance-event-statuses": {
+        "task": "events.tasks.advance_event_statuses",
+        "schedule": crontab(minute="*"),
+    },
 }
 
 app.conf.timezone = "Europe/Berlin"
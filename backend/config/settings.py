@@ -43,6 +43,7 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "django.contrib.sites",
+    "django.contrib.sitemaps",
     
     # 3rd party - Auth
     "allauth",
@@ -175,14 +176,17 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 if not os.environ.get('DOCKER_ENV') and any(cmd in sys.argv for cmd in ['runserver', 'migrate', 'makemigrations', 'shell', 'createsuperuser']):
     DATABASES['default']['HOST'] = 'localhost'
 
-# Cache (Redis)
+# Cache (Redis + LRU в памяти процесса, см. core/cache_backends.py)
 if os.environ.get('REDIS_URL'):
     CACHES = {
         'default': {
-            'BACKEND': 'django_redis.cache.RedisCache',
+            'BACKEND': 'core.cache_backends.TwoTierCache',
             'LOCATION': os.environ.get('REDIS_URL', 'redis://127.0.0.1:6379/1'),
             'OPTIONS': {
                 'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+                'L1_MAX_BYTES': int(os.getenv('CACHE_L1_MAX_BYTES', 32 * 1024 * 1024)),
+                'L1_MAX_ITEM_BYTES': int(os.getenv('CACHE_L1_MAX_ITEM_BYTES', 512 * 1024)),
+                'L1_TIMEOUT': int(os.getenv('CACHE_L1_TIMEOUT', 30)),
             }
         }
     }
@@ -310,6 +314,22 @@ STATIC_ROOT = BASE_DIR / "collected_static"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Выгрузка публичных страниц для nginx (manage.py export_static_site).
+# Если задано — выгрузка повторяется после изменений в админке
+STATIC_EXPORT_ROOT = os.getenv("STATIC_EXPORT_ROOT", "")
+# Адрес сайта для выгрузки (схема и хост, например https://parisweek.ru):
+# с ним строятся абсолютные ссылки в страницах. Без него выгрузка не запускается
+SITE_URL = os.getenv("SITE_URL", "").rstrip("/")
+
+# Версия сборки — входит в ETag страниц, чтобы после деплоя с новой
+# статикой браузеры не получали 304 на старую разметку.
+# Dockerfile пишет её в .build_info (BUILD_HASH=...)
+BUILD_HASH = os.getenv("BUILD_HASH", "")
+if not BUILD_HASH and (BASE_DIR / ".build_info").exists():
+    for line in (BASE_DIR / ".build_info").read_text().splitlines():
+        if line.startswith("BUILD_HASH="):
+            BUILD_HASH = line.split("=", 1)[1].strip()
+
 # Crispy Forms
 CRISPY_ALLOWED_TEMPLATE_PACKS = "bootstrap5"
 CRISPY_TEMPLATE_PACK = "bootstrap5"
@@ -354,6 +374,46 @@ CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = TIME_ZONE
 
+# ===========================================
+# ЗАЯВКИ (очередь в Redis, см. core/leads.py)
+# ===========================================
+# Пусто — заявки сохраняются сразу в запросе
+LEADS_REDIS_URL = os.getenv("LEADS_REDIS_URL", os.getenv("REDIS_URL", ""))
+LEADS_BATCH_SIZE = 100
+LEADS_CLAIM_IDLE_MS = 60 * 1000  # через сколько забирать заявки у упавшего потребителя
+LEADS_MAX_DELIVERIES = 5  # после стольких неудачных попыток заявка уходит в core:leads:dead
+
+# Лимиты заявок (см. core/ratelimit.py): source -> {ведро: (заявок, за секунд)}.
+# Незнакомый source считается по "default"
+LEAD_RATE_LIMITS = {
+    "default": {"ip": (5, 60 * 10), "phone": (3, 60 * 60), "email": (3, 60 * 60)},
+    "callback": {"ip": (5, 60 * 10), "phone": (3, 60 * 60), "email": (3, 60 * 60)},
+}
+LEAD_DEDUP_WINDOW = 60 * 10  # повтор той же заявки за это время не записывается
+# Прокси, которым верим X-Forwarded-For: nginx на хосте и в docker-сети.
+# Адрес посетителя — первый справа адрес в цепочке, не входящий в этот список
+TRUSTED_PROXIES = [
+    net.strip()
+    for net in os.getenv("TRUSTED_PROXIES", "127.0.0.1/32,::1/128,172.16.0.0/12").split(",")
+    if net.strip()
+]
+# Код страны для телефонов без него (нормализация в E.164, см. core/identity.py)
+PHONE_DEFAULT_COUNTRY_CODE = os.getenv("PHONE_DEFAULT_COUNTRY_CODE", "7")
+
+# Уведомления о заявках из popup (см. core/notifications.py)
+TELEGRAM_API_URL = os.getenv("TELEGRAM_API_URL", "https://api.telegram.org")
+TELEGRAM_CHAT_INTERVAL = 3  # секунд между сообщениями в один чат
+LEAD_NOTIFY_DELAY = 10  # заявки за это время уходят одной сводкой
+
+# ===========================================
+# YOUTUBE POSTERS (см. core/youtube.py)
+# ===========================================
+YOUTUBE_POSTER_FETCHER = os.getenv("YOUTUBE_POSTER_FETCHER", "core.youtube.fetch_poster")
+YOUTUBE_POSTER_URL = os.getenv("YOUTUBE_POSTER_URL", "https://img.youtube.com/vi/{id}/hqdefault.jpg")
+YOUTUBE_POSTER_CONCURRENCY = int(os.getenv("YOUTUBE_POSTER_CONCURRENCY", 4))
+YOUTUBE_POSTER_RETRIES = 3
+YOUTUBE_POSTER_BACKOFF = 1  # секунды, удваивается с каждой попыткой
+
 # ===========================================
 # THUMBNAILS (Filer)
 # ===========================================
@@ -2,10 +2,19 @@
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
+from django.contrib.sitemaps.views import sitemap
 from django.urls import include, path
 from django.views.i18n import set_language
 
+from core.sitemaps import CourseSitemap, StaticSitemap
+
+sitemaps = {
+    "static": StaticSitemap,
+    "courses": CourseSitemap,
+}
+
 urlpatterns = [
+    path("sitemap.xml", sitemap, {"sitemaps": sitemaps}, name="django.contrib.sitemaps.views.sitemap"),
     path("set-language/", set_language, name="set_language"),
     path("admin/", admin.site.urls),
     path('accounts/', include('allauth.urls')),
@@ -17,6 +26,8 @@ urlpatterns = [
     # path('teachers/', include('teachers.urls', namespace='teachers')),
 ]
 
+handler404 = "core.views.page_not_found"
+
 if settings.DEBUG:
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -1,18 +1,115 @@
-from django.contrib import admin
+from urllib.parse import urlencode
+
+from django.contrib import admin, messages
+from django.shortcuts import redirect
+from django.urls import reverse
 from .models import CodeSnippet, ContactRequest, FAQ, SiteSettings, Popup, HeaderButton, Review, WhySpanishItem
-from .models import VideoReview
+from .models import LeadNotification, VideoReview
+from .admin_mixins import DateRangeFilter, LargeTableAdminMixin
+from .exports import XLSX_SYNC_LIMIT, csv_response, xlsx_response
+from .identity import IDENTITY_FIELDS, identity_q
+from .page_cache import purge_page_cache
+from .search import SearchAdminMixin
+
+
+# Сколько разных значений контакта можно передать в фильтр «Этот человек»
+PERSON_MAX_VALUES = 100
+
+
+def person_leads_url(phones=(), emails=(), telegrams=()):
+    """Список заявок с фильтром по нормализованным контактам."""
+    params = {
+        f"person_{field}": ",".join(sorted(set(filter(None, values)))[:PERSON_MAX_VALUES])
+        for field, values in (("phone", phones), ("email", emails), ("telegram", telegrams))
+    }
+    return reverse("admin:core_contactrequest_changelist") + "?" + urlencode({k: v for k, v in params.items() if v})
+
+
+class SamePersonFilter(admin.ListFilter):
+    """Заявки с тем же телефоном, email или Telegram (любое совпадение)."""
+
+    title = "Этот человек"
+
+    def __init__(self, request, params, model, model_admin):
+        super().__init__(request, params, model, model_admin)
+        self.values = {}
+        for field in IDENTITY_FIELDS:
+            value = params.pop(f"person_{field}", "")
+            self.used_parameters[f"person_{field}"] = value
+            self.values[field] = [v for v in value.split(",") if v][:PERSON_MAX_VALUES]
+
+    def has_output(self):
+        return any(self.values.values())
+
+    def expected_parameters(self):
+        return [f"person_{field}" for field in IDENTITY_FIELDS]
+
+    def queryset(self, request, queryset):
+        if not self.has_output():
+            return queryset
+        return queryset.filter(
+            identity_q(self.values["phone"], self.values["email"], self.values["telegram"])
+        )
+
+    def choices(self, changelist):
+        yield {
+            "selected": False,
+            "query_string": changelist.get_query_string(remove=self.expected_parameters()),
+            "display": "Все",
+        }
+        yield {
+            "selected": True,
+            "query_string": changelist.get_query_string(),
+            "display": ", ".join(value for values in self.values.values() for value in values),
+        }
 
 
 @admin.register(ContactRequest)
-class ContactRequestAdmin(admin.ModelAdmin):
+class ContactRequestAdmin(SearchAdminMixin, LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ["name", "phone", "email", "source", "is_processed", "created_at"]
-    list_filter = ["is_processed", "source", "created_at"]
+    list_filter = [SamePersonFilter, "is_processed", "source", ("created_at", DateRangeFilter)]
     search_fields = ["name", "phone", "email"]
     readonly_fields = ["created_at"]
+    actions = ["same_person", "export_csv", "export_xlsx"]
+
+    @admin.action(description="Все заявки этого человека")
+    def same_person(self, request, queryset):
+        rows = queryset.values_list(*IDENTITY_FIELDS.values())
+        phones, emails, telegrams = zip(*rows) if rows else ((), (), ())
+        if not any(phones + emails + telegrams):
+            self.message_user(request, "У выбранных заявок нет контактов для поиска", messages.WARNING)
+            return None
+        return redirect(person_leads_url(phones, emails, telegrams))
+
+    @admin.action(description="Выгрузить в CSV")
+    def export_csv(self, request, queryset):
+        return csv_response(queryset)
+
+    @admin.action(description="Выгрузить в XLSX")
+    def export_xlsx(self, request, queryset):
+        # XLSX собирается целиком до первого байта ответа — большие выгрузки
+        # не должны упираться в таймаут nginx
+        if queryset.order_by()[:XLSX_SYNC_LIMIT + 1].count() > XLSX_SYNC_LIMIT:
+            self.message_user(
+                request,
+                f"Больше {XLSX_SYNC_LIMIT} заявок: выгрузите в CSV (отдаётся потоком) "
+                "или командой manage.py export_leads --format xlsx --output <файл>",
+                messages.WARNING,
+            )
+            return None
+        return xlsx_response(queryset)
+
+
+@admin.register(LeadNotification)
+class LeadNotificationAdmin(admin.ModelAdmin):
+    list_display = ["contact_request", "popup", "channel", "status", "attempts", "created_at", "sent_at"]
+    list_filter = ["status", "channel", "popup"]
+    list_select_related = ["contact_request", "popup"]
+    readonly_fields = ["contact_request", "popup", "channel", "attempts", "last_error", "created_at", "sent_at"]
 
 
 @admin.register(Review)
-class ReviewAdmin(admin.ModelAdmin):
+class ReviewAdmin(SearchAdminMixin, admin.ModelAdmin):
     list_display = ['user_name', 'rating', 'is_active', 'created_at']
     list_filter = ['is_active', 'rating']
     list_editable = ['is_active']
@@ -20,7 +117,7 @@ class ReviewAdmin(admin.ModelAdmin):
 
 
 @admin.register(FAQ)
-class FAQAdmin(admin.ModelAdmin):
+class FAQAdmin(SearchAdminMixin, admin.ModelAdmin):
     list_display = ["question", "order", "is_active"]
     list_filter = ["is_active"]
     list_editable = ["order", "is_active"]
@@ -44,6 +141,12 @@ class SiteSettingsAdmin(admin.ModelAdmin):
             "fields": ("meta_title", "meta_description")
         }),
     )
+    actions = ["purge_page_cache"]
+
+    @admin.action(description="Сбросить кэш всех страниц")
+    def purge_page_cache(self, request, queryset):
+        purge_page_cache()
+        self.message_user(request, "Кэш страниц сброшен", messages.SUCCESS)
     
     def has_add_permission(self, request):
         # Только одна запись
@@ -69,7 +172,7 @@ class WhySpanishItemAdmin(admin.ModelAdmin):
 
 
 @admin.register(CodeSnippet)
-class CodeSnippetAdmin(admin.ModelAdmin):
+class CodeSnippetAdmin(SearchAdminMixin, admin.ModelAdmin):
     list_display = ["name", "location", "order", "is_active", "updated_at"]
     list_filter = ["location", "is_active"]
     list_editable = ["order", "is_active"]
@@ -0,0 +1,189 @@
+"""
+Версионированный кэш.
+
+Версия пространства имён хранится в общем кэше (Redis), поэтому её смена
+сразу видна всем воркерам gunicorn. Данные под старой версией просто
+перестают читаться и истекают сами.
+"""
+import math
+import random
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+VERSION_KEY = "core:version:{}"
+SNAPSHOT_KEY = "core:snapshot:{}:{}"
+STATS_KEY = "core:stats:{}"
+LOCK_KEY = "{}:lock"
+
+# Пересборка записи не должна длиться дольше — иначе замок снимется сам
+FILL_LOCK_TIMEOUT = 30
+# Сколько запись живёт после мягкого истечения, чтобы было что отдать «устаревшим»
+STALE_TIMEOUT = 60 * 60 * 24
+# Коэффициент раннего истечения: больше — раньше начинаем пересборку
+EARLY_EXPIRY_BETA = 1.0
+FILL_WAIT_STEP = 0.05
+FILL_WAIT_STEPS = 20
+
+
+def get_version(namespace):
+    """Текущая версия пространства имён."""
+    key = VERSION_KEY.format(namespace)
+    version = cache.get(key)
+    if version is None:
+        # Версия — метка времени, а не счётчик: после вытеснения ключа
+        # из Redis номера не начнутся заново и не совпадут со старыми
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def get_versions(namespaces):
+    """Версии нескольких пространств имён за одно обращение к кэшу."""
+    keys = [VERSION_KEY.format(namespace) for namespace in namespaces]
+    found = cache.get_many(keys)
+    for namespace, key in zip(namespaces, keys):
+        if key not in found:
+            found[key] = get_version(namespace)
+    return tuple(found[key] for key in keys)
+
+
+def model_namespace(model):
+    """Пространство имён, версия которого меняется при сохранении модели."""
+    return f"model:{model._meta.label_lower}"
+
+
+def bump_version(namespace):
+    """Сменить версию сразу."""
+    cache.set(VERSION_KEY.format(namespace), time.time_ns(), None)
+
+
+def bump_version_on_commit(namespace):
+    """Сменить версию после коммита транзакции.
+
+    Иначе другой воркер успеет пересобрать данные под новой версией
+    ещё из старого состояния базы.
+    """
+    transaction.on_commit(lambda: bump_version(namespace))
+
+
+class VersionedSnapshot:
+    """Снимок данных в памяти процесса поверх общего кэша.
+
+    На каждый вызов — одно чтение версий из общего кэша. Пока версии
+    не изменились, отдаётся объект из памяти процесса; после смены версии
+    снимок берётся из общего кэша или собирается заново через builder.
+    namespace — строка или кортеж, если снимок зависит от нескольких моделей.
+    """
+
+    def __init__(self, namespace, builder, timeout=60 * 60):
+        self.namespaces = (namespace,) if isinstance(namespace, str) else tuple(namespace)
+        self.builder = builder
+        self.timeout = timeout
+        self._current = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        version = get_versions(self.namespaces)
+        current = self._current
+        if current is not None and current[0] == version:
+            return current[1]
+
+        with self._lock:
+            current = self._current
+            if current is not None and current[0] == version:
+                return current[1]
+
+            key = SNAPSHOT_KEY.format(",".join(self.namespaces), "-".join(map(str, version)))
+            value = cache.get(key)
+            if value is None:
+                value = self.builder()
+                cache.set(key, value, self.timeout)
+            self._current = (version, value)
+            return value
+
+    def invalidate(self):
+        for namespace in self.namespaces:
+            bump_version_on_commit(namespace)
+
+
+def incr_counter(name):
+    key = STATS_KEY.format(name)
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+
+def get_counters(names):
+    found = cache.get_many([STATS_KEY.format(name) for name in names])
+    return {name: found.get(STATS_KEY.format(name), 0) for name in names}
+
+
+def should_refresh_early(entry, now, beta=EARLY_EXPIRY_BETA):
+    """Вероятностное раннее истечение (XFetch).
+
+    Чем ближе мягкий срок и чем дольше запись собиралась, тем вероятнее,
+    что один из запросов возьмётся за пересборку заранее — и запись не
+    истечёт у всех воркеров одновременно.
+    """
+    return now - entry["delta"] * beta * math.log(1.0 - random.random()) >= entry["expires_at"]
+
+
+def get_or_fill(key, fill, *, versions=(), timeout, serve_stale=True):
+    """Значение из кэша с защитой от одновременной пересборки.
+
+    fill() собирает значение; если вернул None — ничего не сохраняем.
+    Пересобирает только тот, кто взял замок. Остальные в режиме
+    serve_stale получают предыдущее значение, даже если версии уже сменились,
+    а без него — ждут недолго, пока запись появится.
+    """
+    entry = cache.get(key)
+    now = time.time()
+    if entry is not None and entry["versions"] == versions and not should_refresh_early(entry, now):
+        return entry["value"]
+
+    lock_key = LOCK_KEY.format(key)
+    if cache.add(lock_key, 1, FILL_LOCK_TIMEOUT):
+        try:
+            return _fill(key, fill, versions, timeout)
+        finally:
+            cache.delete(lock_key)
+
+    if entry is not None:
+        if entry["versions"] == versions and now < entry["expires_at"]:
+            # Запись свежая, её заранее пересобирает другой воркер
+            return entry["value"]
+        if serve_stale:
+            incr_counter("stale_hits")
+            return entry["value"]
+
+    for _ in range(FILL_WAIT_STEPS):
+        time.sleep(FILL_WAIT_STEP)
+        entry = cache.get(key)
+        if entry is not None and entry["versions"] == versions:
+            incr_counter("fill_waits")
+            return entry["value"]
+
+    # Тот, кто держит замок, не успел — собираем сами, чтобы не висеть
+    return _fill(key, fill, versions, timeout)
+
+
+def _fill(key, fill, versions, timeout):
+    started = time.time()
+    value = fill()
+    if value is None:
+        return None
+    finished = time.time()
+    entry = {
+        "value": value,
+        "versions": versions,
+        "delta": finished - started,
+        "expires_at": finished + timeout,
+    }
+    cache.set(key, entry, timeout + STALE_TIMEOUT)
+    incr_counter("fills")
+    return value
@@ -0,0 +1,302 @@
+"""
+Двухуровневый кэш: LRU в памяти процесса (L1) поверх Redis (L2).
+
+Мелкие горячие ключи — версии, снимки настроек, меню — читаются из памяти
+без похода в сеть. Каждая запись и удаление публикуются в канал Redis,
+и остальные воркеры выкидывают ключ из своего L1. Пока подписка на канал
+не работает, L1 не используется вовсе, чтобы не отдать удалённое.
+
+Подключение (settings.CACHES):
+
+    "BACKEND": "core.cache_backends.TwoTierCache",
+    "LOCATION": REDIS_URL,
+    "OPTIONS": {
+        "CLIENT_CLASS": "django_redis.client.DefaultClient",
+        "L1_MAX_BYTES": 32 * 1024 * 1024,
+        "L1_MAX_ITEM_BYTES": 512 * 1024,
+        "L1_TIMEOUT": 30,
+    }
+"""
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django_redis.cache import RedisCache
+
+logger = logging.getLogger(__name__)
+
+L1_OPTIONS = {
+    "L1_MAX_BYTES": 32 * 1024 * 1024,
+    "L1_MAX_ITEM_BYTES": 512 * 1024,
+    "L1_TIMEOUT": 30,
+    "INVALIDATION_CHANNEL": "core:cache:invalidate",
+}
+
+
+class LocalLRU:
+    """LRU с ограничением по суммарному размеру значений в байтах."""
+
+    def __init__(self, max_bytes, max_item_bytes):
+        self.max_bytes = max_bytes
+        self.max_item_bytes = max_item_bytes
+        self.size = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, payload = item
+            if expires_at <= time.monotonic():
+                self._pop(key)
+                return None
+            self._data.move_to_end(key)
+            return payload
+
+    def set(self, key, payload, timeout):
+        with self._lock:
+            self._pop(key)
+            if len(payload) > self.max_item_bytes:
+                return
+            self._data[key] = (time.monotonic() + timeout, payload)
+            self.size += len(payload)
+            while self.size > self.max_bytes:
+                self._pop(next(iter(self._data)))
+
+    def delete(self, key):
+        with self._lock:
+            self._pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.size = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def _pop(self, key):
+        item = self._data.pop(key, None)
+        if item is not None:
+            self.size -= len(item[1])
+
+
+class TwoTierCache(BaseCache):
+    def __init__(self, server, params):
+        params = dict(params)
+        options = dict(params.get("OPTIONS", {}))
+        l1_options = {name: options.pop(name, default) for name, default in L1_OPTIONS.items()}
+        params["OPTIONS"] = options
+        super().__init__(params)
+
+        self._l2 = RedisCache(server, params)
+        self._l1 = LocalLRU(l1_options["L1_MAX_BYTES"], l1_options["L1_MAX_ITEM_BYTES"])
+        self._l1_timeout = l1_options["L1_TIMEOUT"]
+        self._channel = l1_options["INVALIDATION_CHANNEL"]
+
+        self._origin = uuid.uuid4().hex
+        self._listener_pid = None
+        self._listening = False
+        self._listener_lock = threading.Lock()
+        # Растёт с каждой чужой инвалидацией: значение, прочитанное из L2 до неё,
+        # в L1 класть уже нельзя
+        self._generation = 0
+        self._stats = {"l1_hits": 0, "l1_misses": 0, "l2_hits": 0, "l2_misses": 0}
+
+    # ----- L1 -----
+
+    def _l1_enabled(self):
+        if self._listener_pid != os.getpid():
+            self._start_listener()
+        return self._listening
+
+    def _l1_get(self, key):
+        payload = self._l1.get(key)
+        if payload is None:
+            self._stats["l1_misses"] += 1
+            return None
+        self._stats["l1_hits"] += 1
+        return pickle.loads(payload)
+
+    def _l1_set(self, key, value, timeout):
+        timeout = self._l2.get_backend_timeout(timeout)
+        if timeout is not None and timeout <= 0:
+            return
+        l1_timeout = self._l1_timeout if timeout is None else min(timeout, self._l1_timeout)
+        # Храним сериализованным: вызывающие не делят один изменяемый объект
+        self._l1.set(key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), l1_timeout)
+
+    # ----- инвалидация между воркерами -----
+
+    def _start_listener(self):
+        with self._listener_lock:
+            if self._listener_pid == os.getpid():
+                return
+            # После fork память родителя не годится: подписки у нас ещё нет
+            self._listener_pid = os.getpid()
+            self._listening = False
+            self._l1.clear()
+            thread = threading.Thread(target=self._listen, name="cache-invalidation", daemon=True)
+            thread.start()
+
+    def _listen(self):
+        while True:
+            try:
+                client = self._l2.client.get_client(write=False)
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self._channel)
+                # Всё, что могли пропустить без подписки, — выбрасываем
+                self._l1.clear()
+                self._listening = True
+                for message in pubsub.listen():
+                    self._on_invalidation(message["data"])
+            except Exception:
+                logger.warning("Cache invalidation listener disconnected", exc_info=True)
+            self._listening = False
+            self._l1.clear()
+            time.sleep(1)
+
+    def _on_invalidation(self, data):
+        message = json.loads(data)
+        if message["origin"] == self._origin:
+            return
+        self._generation += 1
+        if message["keys"] is None:
+            self._l1.clear()
+            return
+        for key in message["keys"]:
+            self._l1.delete(key)
+
+    def _publish(self, keys):
+        message = json.dumps({"origin": self._origin, "keys": keys})
+        try:
+            self._l2.client.get_client(write=True).publish(self._channel, message)
+        except Exception:
+            # Не смогли оповестить — другие воркеры увидят изменение через L1_TIMEOUT
+            logger.warning("Cache invalidation publish failed", exc_info=True)
+
+    # ----- API кэша -----
+
+    def get(self, key, default=None, version=None):
+        local_key = self.make_key(key, version)
+        use_l1 = self._l1_enabled()
+        if use_l1:
+            value = self._l1_get(local_key)
+            if value is not None:
+                return value
+
+        generation = self._generation
+        value = self._l2.get(key, default=None, version=version)
+        if value is None:
+            self._stats["l2_misses"] += 1
+            return default
+        self._stats["l2_hits"] += 1
+        if use_l1 and generation == self._generation:
+            self._l1_set(local_key, value, DEFAULT_TIMEOUT)
+        return value
+
+    def get_many(self, keys, version=None):
+        result = {}
+        missing = []
+        use_l1 = self._l1_enabled()
+        for key in keys:
+            value = self._l1_get(self.make_key(key, version)) if use_l1 else None
+            if value is None:
+                missing.append(key)
+            else:
+                result[key] = value
+
+        if missing:
+            generation = self._generation
+            found = self._l2.get_many(missing, version=version)
+            self._stats["l2_hits"] += len(found)
+            self._stats["l2_misses"] += len(missing) - len(found)
+            if use_l1 and generation == self._generation:
+                for key, value in found.items():
+                    self._l1_set(self.make_key(key, version), value, DEFAULT_TIMEOUT)
+            result.update(found)
+        return result
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        local_key = self.make_key(key, version)
+        self._l2.set(key, value, timeout=timeout, version=version)
+        self._publish([local_key])
+        if self._l1_enabled():
+            self._l1_set(local_key, value, timeout)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self._l2.set_many(data, timeout=timeout, version=version)
+        self._publish([self.make_key(key, version) for key in data])
+        if self._l1_enabled():
+            for key, value in data.items():
+                if key not in failed:
+                    self._l1_set(self.make_key(key, version), value, timeout)
+        return failed
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self._l2.add(key, value, timeout=timeout, version=version)
+        if added:
+            local_key = self.make_key(key, version)
+            self._publish([local_key])
+            if self._l1_enabled():
+                self._l1_set(local_key, value, timeout)
+        return added
+
+    def delete(self, key, version=None):
+        local_key = self.make_key(key, version)
+        self._l1.delete(local_key)
+        deleted = self._l2.delete(key, version=version)
+        self._publish([local_key])
+        return deleted
+
+    def delete_many(self, keys, version=None):
+        local_keys = [self.make_key(key, version) for key in keys]
+        for local_key in local_keys:
+            self._l1.delete(local_key)
+        self._l2.delete_many(keys, version=version)
+        self._publish(local_keys)
+
+    def incr(self, key, delta=1, version=None):
+        # Счётчики в L1 не держим: значение важнее скорости
+        local_key = self.make_key(key, version)
+        self._l1.delete(local_key)
+        value = self._l2.incr(key, delta=delta, version=version)
+        self._publish([local_key])
+        return value
+
+    def decr(self, key, delta=1, version=None):
+        return self.incr(key, -delta, version=version)
+
+    def has_key(self, key, version=None):
+        if self._l1_enabled() and self._l1.get(self.make_key(key, version)) is not None:
+            return True
+        return self._l2.has_key(key, version=version)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self._l2.touch(key, timeout=timeout, version=version)
+
+    def clear(self):
+        self._l1.clear()
+        self._l2.clear()
+        self._publish(None)
+
+    def close(self, **kwargs):
+        self._l2.close(**kwargs)
+
+    def stats(self):
+        """Попадания и промахи по уровням в этом процессе."""
+        return dict(self._stats, l1_items=len(self._l1), l1_bytes=self._l1.size)
+
+    def __getattr__(self, name):
+        # lock(), ttl() и прочее из django_redis — напрямую в L2
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._l2, name)
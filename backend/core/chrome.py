@@ -0,0 +1,79 @@
+"""
+«Обвязка» сайта: настройки и сниппеты.
+
+Всё, что нужно base.html на каждой странице, собирается одним снимком
+и живёт в памяти процесса, пока в админке ничего не поменяли.
+"""
+from dataclasses import dataclass
+
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils import translation
+
+from courses.catalog import CATALOG_NAMESPACE, get_catalog
+
+from .cache import VersionedSnapshot, get_versions
+from .models import CodeSnippet, SiteSettings
+
+CHROME_NAMESPACE = "chrome"
+# От чего зависят общие блоки каждой страницы: настройки и меню курсов
+CHROME_NAMESPACES = (CHROME_NAMESPACE, CATALOG_NAMESPACE)
+
+
+@dataclass(frozen=True)
+class SiteChrome:
+    settings: SiteSettings
+    snippets: dict
+
+
+def build_site_chrome():
+    """Собирает снимок из базы — только при смене версии, не на каждый рендер."""
+    snippets = {location: [] for location, _ in CodeSnippet.LOCATION_CHOICES}
+    for snippet in CodeSnippet.objects.filter(is_active=True).only("location", "code"):
+        snippets[snippet.location].append(snippet.code)
+
+    return SiteChrome(
+        settings=SiteSettings.get(),
+        snippets={location: "\n".join(codes) for location, codes in snippets.items()},
+    )
+
+
+site_chrome = VersionedSnapshot(CHROME_NAMESPACE, build_site_chrome)
+
+
+def get_site_chrome():
+    return site_chrome.get()
+
+
+FRAGMENT_KEY = "core:fragment:{}:{}:{}"
+_fragments = {}
+
+
+def render_fragment(template_name, language):
+    """Готовый HTML общего блока (header, меню, footer) для языка.
+
+    Блоки одинаковы для всех анонимов, поэтому рендерятся один раз на
+    язык и версию обвязки и каталога, а дальше берутся из памяти процесса.
+    """
+    version = "-".join(map(str, get_versions(CHROME_NAMESPACES)))
+    key = FRAGMENT_KEY.format(template_name, language, version)
+    html = _fragments.get(key)
+    if html is not None:
+        return html
+
+    html = cache.get(key)
+    if html is None:
+        chrome = get_site_chrome()
+        with translation.override(language):
+            html = render_to_string(template_name, {
+                "LANGUAGE_CODE": language,
+                "settings": chrome.settings,
+                "course_catalog": get_catalog(),
+            })
+        cache.set(key, html, 60 * 60 * 24)
+
+    # Фрагменты прежних версий больше не понадобятся
+    for stale in [k for k in _fragments if not k.endswith(f":{version}")]:
+        _fragments.pop(stale, None)
+    _fragments[key] = html
+    return html
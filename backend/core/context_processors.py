@@ -1,21 +1,13 @@
-from .models import SiteSettings, CodeSnippet
+from .chrome import get_site_chrome
 
 
 def site_settings(request):
     """Добавляет настройки сайта и сниппеты во все шаблоны"""
-    try:
-        snippets = CodeSnippet.objects.filter(is_active=True)
-        snippets_head = list(snippets.filter(location='head'))
-        snippets_body_start = list(snippets.filter(location='body_start'))
-        snippets_body_end = list(snippets.filter(location='body_end'))
-    except Exception:
-        snippets_head = []
-        snippets_body_start = []
-        snippets_body_end = []
-    
+    chrome = get_site_chrome()
+
     return {
-        'settings': SiteSettings.get(),
-        'snippets_head': snippets_head,
-        'snippets_body_start': snippets_body_start,
-        'snippets_body_end': snippets_body_end,
-    }
\ No newline at end of file
+        'settings': chrome.settings,
+        'snippets_head': chrome.snippets['head'],
+        'snippets_body_start': chrome.snippets['body_start'],
+        'snippets_body_end': chrome.snippets['body_end'],
+    }
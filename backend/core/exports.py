@@ -0,0 +1,128 @@
+"""
+Выгрузка заявок в CSV/XLSX.
+
+Строки читаются курсором на сервере базы (iterator(chunk_size)) и сразу
+уходят клиенту — память не растёт с размером выгрузки, а nginx получает
+данные непрерывно и не обрывает соединение по proxy_read_timeout.
+
+XLSX — через openpyxl. Файл пишется в режиме write_only во
+временный файл: zip-архив нельзя отдавать по частям до его закрытия.
+Поэтому из админки XLSX — не больше XLSX_SYNC_LIMIT строк, большие
+выгрузки делает manage.py export_leads.
+"""
+import csv
+import tempfile
+from datetime import datetime, time, timedelta
+
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
+from openpyxl import Workbook
+
+from .models import ContactRequest
+
+CHUNK_SIZE = 2000
+# Больше — только CSV или manage.py export_leads (XLSX не отдать потоком)
+XLSX_SYNC_LIMIT = 20_000
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+COLUMNS = (
+    ("id", "ID"),
+    ("created_at", "Дата"),
+    ("name", "Имя"),
+    ("phone", "Телефон"),
+    ("email", "Email"),
+    ("telegram", "Telegram"),
+    ("message", "Сообщение"),
+    ("source", "Источник"),
+    ("is_processed", "Обработано"),
+)
+
+
+def start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def leads_queryset(source=None, is_processed=None, date_from=None, date_to=None):
+    """Заявки по фильтрам; даты — включительно."""
+    queryset = ContactRequest.objects.all()
+    if source:
+        queryset = queryset.filter(source=source)
+    if is_processed is not None:
+        queryset = queryset.filter(is_processed=is_processed)
+    # Полуинтервал [с, по + 1 день) по самой колонке — как в DateRangeFilter,
+    # без __date, чтобы работал индекс created_at
+    if date_from:
+        queryset = queryset.filter(created_at__gte=start_of_day(date_from))
+    if date_to:
+        queryset = queryset.filter(created_at__lt=start_of_day(date_to + timedelta(days=1)))
+    return queryset
+
+
+# Так Excel начинает формулу; поля приходят из публичной формы
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def safe_cell(value):
+    """Текст, который Excel не примет за формулу."""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def iter_rows(queryset):
+    rows = queryset.order_by("pk").values_list(*(name for name, _ in COLUMNS))
+    for row in rows.iterator(chunk_size=CHUNK_SIZE):
+        row = [safe_cell(value) for value in row]
+        row[1] = timezone.localtime(row[1]).strftime("%Y-%m-%d %H:%M")
+        row[-1] = "да" if row[-1] else "нет"
+        yield row
+
+
+class Echo:
+    """Файл для csv.writer, который возвращает строку вместо записи."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(queryset):
+    writer = csv.writer(Echo())
+    # BOM — чтобы Excel открыл UTF-8 без мастера импорта
+    yield "\ufeff" + writer.writerow([title for _, title in COLUMNS])
+    lines = []
+    for row in iter_rows(queryset):
+        lines.append(writer.writerow(row))
+        # Отдаём пачками: по строке на write() — слишком много мелких пакетов
+        if len(lines) >= 500:
+            yield "".join(lines)
+            lines = []
+    if lines:
+        yield "".join(lines)
+
+
+def write_xlsx(queryset, file):
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Заявки")
+    sheet.append([title for _, title in COLUMNS])
+    for row in iter_rows(queryset):
+        sheet.append(row)
+    workbook.save(file)
+
+
+def export_filename(extension):
+    return f"leads-{timezone.localdate():%Y-%m-%d}.{extension}"
+
+
+def csv_response(queryset):
+    response = StreamingHttpResponse(iter_csv(queryset), content_type="text/csv; charset=utf-8")
+    response["Content-Disposition"] = f'attachment; filename="{export_filename("csv")}"'
+    # nginx не копит ответ в буфере, а сразу отдаёт строки клиенту
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+def xlsx_response(queryset):
+    file = tempfile.TemporaryFile()
+    write_xlsx(queryset, file)
+    file.seek(0)
+    return FileResponse(file, as_attachment=True, filename=export_filename("xlsx"), content_type=XLSX_CONTENT_TYPE)
@@ -0,0 +1,14 @@
+from django import forms
+
+from .models import ContactRequest
+
+
+class ContactRequestForm(forms.ModelForm):
+    """Заявка с сайта; длины и формат email — как в модели."""
+
+    class Meta:
+        model = ContactRequest
+        fields = ["name", "phone", "email", "telegram", "message", "source"]
+
+    def clean_source(self):
+        return self.cleaned_data["source"] or "website"
@@ -0,0 +1,81 @@
+"""
+Нормализованные контакты заявки: по ним находятся повторные заявки
+одного человека и его аккаунт (accounts.User).
+
+- телефон — E.164 (+79161234567): «8 (916) 123-45-67» и «+7 916 123 45 67»
+  дают одно значение; номер без кода страны получает
+  PHONE_DEFAULT_COUNTRY_CODE;
+- email — без пробелов, в нижнем регистре;
+- Telegram — имя пользователя без @ и t.me/, в нижнем регистре.
+
+Значения пишутся в индексированные колонки *_normalized при сохранении
+заявки; для старых строк — manage.py backfill_lead_identity.
+"""
+import re
+
+from django.conf import settings
+from django.db.models import Q
+
+TELEGRAM_PREFIX_RE = re.compile(r"^(?:https?://)?(?:www\.)?(?:t\.me/|telegram\.me/|@)", re.IGNORECASE)
+TELEGRAM_USERNAME_RE = re.compile(r"^[a-z][a-z0-9_]{3,31}$")
+
+IDENTITY_FIELDS = {
+    "phone": "phone_normalized",
+    "email": "email_normalized",
+    "telegram": "telegram_normalized",
+}
+
+
+def normalize_phone(phone):
+    """Номер в E.164 или '', если номер не похож на телефонный."""
+    phone = (phone or "").strip()
+    digits = re.sub(r"\D", "", phone)
+    if not digits:
+        return ""
+    country_code = settings.PHONE_DEFAULT_COUNTRY_CODE
+    if phone.startswith("+"):
+        pass
+    elif digits.startswith("00"):
+        digits = digits[2:]
+    elif country_code == "7" and len(digits) == 11 and digits[0] == "8":
+        # Российский формат 8 XXX — то же, что +7 XXX
+        digits = "7" + digits[1:]
+    elif len(digits) == 10:
+        digits = country_code + digits
+    # В E.164 не больше 15 цифр; короче 8 — не номер, а обрывок
+    if not 8 <= len(digits) <= 15:
+        return ""
+    return "+" + digits
+
+
+def normalize_email(email):
+    return (email or "").strip().lower()
+
+
+def normalize_telegram(telegram):
+    """Имя пользователя Telegram или '', если в поле что-то другое."""
+    username = TELEGRAM_PREFIX_RE.sub("", (telegram or "").strip())
+    username = username.split("/", 1)[0].split("?", 1)[0].lower()
+    return username if TELEGRAM_USERNAME_RE.match(username) else ""
+
+
+NORMALIZERS = {
+    "phone": normalize_phone,
+    "email": normalize_email,
+    "telegram": normalize_telegram,
+}
+
+
+def identity_of(obj):
+    """{поле: нормализованное значение} для заявки или пользователя."""
+    return {field: NORMALIZERS[field](getattr(obj, field, "")) for field in IDENTITY_FIELDS}
+
+
+def identity_q(phones=(), emails=(), telegrams=()):
+    """Заявки, совпадающие хотя бы по одному из контактов."""
+    q = Q(pk__in=[])
+    for field, values in (("phone", phones), ("email", emails), ("telegram", telegrams)):
+        values = [value for value in values if value]
+        if values:
+            q |= Q(**{f"{IDENTITY_FIELDS[field]}__in": values})
+    return q
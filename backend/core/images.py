@@ -0,0 +1,93 @@
+"""
+Адаптивные варианты загруженных изображений.
+
+После загрузки картинки Celery-задача режет её по ширинам в WebP (и AVIF,
+если Pillow собран с его поддержкой), без EXIF. Список готовых вариантов
+хранится в поле image_variants модели, тег {% responsive_img %} строит
+по нему srcset.
+
+image_variants = {
+    "<поле>": {
+        "source": "<имя исходного файла>",
+        "width": 1920, "height": 1080,
+        "webp": {"640": "variants/...-640w.webp", ...},
+        "avif": {...},
+    },
+}
+"""
+import io
+from pathlib import PurePosixPath
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+VARIANT_WIDTHS = (320, 640, 960, 1280, 1920)
+VARIANT_QUALITY = {"webp": 80, "avif": 60}
+VARIANTS_DIR = "variants"
+
+
+def variant_formats():
+    Image.init()
+    formats = ["webp"]
+    if "AVIF" in Image.SAVE:
+        formats.append("avif")
+    return formats
+
+
+def variant_widths(width):
+    """Ширины меньше исходной и сама исходная — увеличивать незачем."""
+    return sorted({w for w in VARIANT_WIDTHS if w < width} | {min(width, VARIANT_WIDTHS[-1])})
+
+
+def variant_name(source_name, width, fmt):
+    path = PurePosixPath(source_name)
+    return str(PurePosixPath(VARIANTS_DIR) / path.parent / f"{path.stem}-{width}w.{fmt}")
+
+
+def save_variant(name, data):
+    if default_storage.exists(name):
+        default_storage.delete(name)
+    return default_storage.save(name, ContentFile(data))
+
+
+def build_variants(field_file):
+    """Нарезать варианты для файла из ImageField."""
+    with field_file.open("rb") as f:
+        image = Image.open(f)
+        image.load()
+
+    # Поворот по EXIF применяем, а сами метаданные (GPS, камера) не переносим
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+    image.info = {}
+
+    result = {"source": field_file.name, "width": image.width, "height": image.height}
+    for fmt in variant_formats():
+        result[fmt] = {}
+        for width in variant_widths(image.width):
+            height = round(image.height * width / image.width)
+            resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+            buffer = io.BytesIO()
+            resized.save(buffer, format=fmt.upper(), quality=VARIANT_QUALITY[fmt])
+            result[fmt][str(width)] = save_variant(variant_name(field_file.name, width, fmt), buffer.getvalue())
+    return result
+
+
+def pending_variant_fields(instance):
+    """Поля, для которых варианты ещё не нарезаны под текущий файл."""
+    fields = []
+    for field_name in instance.responsive_image_fields:
+        field_file = getattr(instance, field_name)
+        done = instance.image_variants.get(field_name, {})
+        if field_file and done.get("source") != field_file.name:
+            fields.append(field_name)
+    return fields
+
+
+def srcset(variants, fmt):
+    return ", ".join(
+        f"{default_storage.url(name)} {width}w"
+        for width, name in sorted(variants.get(fmt, {}).items(), key=lambda item: int(item[0]))
+    )
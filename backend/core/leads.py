@@ -0,0 +1,194 @@
+"""
+Приём заявок через очередь.
+
+Форма проверяется в веб-воркере, заявка кладётся в Redis stream, и ответ
+уходит сразу. Запись в базу делает consume_leads (manage.py consume_leads)
+пачками через bulk_create.
+
+Доставка «хотя бы один раз»: сообщение подтверждается (XACK) только после
+коммита. Если потребитель упал посреди пачки, её подберёт следующий через
+XAUTOCLAIM. Повторная вставка не создаёт дубль — у заявки уникальный
+idempotency_key (ignore_conflicts).
+
+Сообщение, которое не удаётся сохранить, не должно останавливать
+очередь: пачка, упавшая целиком, сохраняется по одной заявке, а
+неудачные остаются неподтверждёнными до следующей попытки. После
+LEADS_MAX_DELIVERIES доставок (счётчик из XPENDING) или сразу, если
+сообщение не разбирается, оно переносится в DEAD_LETTER_KEY с текстом
+ошибки и подтверждается. Посмотреть такие заявки — XRANGE core:leads:dead - +.
+
+Без Redis (LEADS_REDIS_URL не задан) или при его недоступности заявка
+сохраняется сразу, как раньше.
+"""
+import hashlib
+import json
+import logging
+import os
+import socket
+
+import redis
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ContactRequest
+from .notifications import notify_new_leads
+
+logger = logging.getLogger(__name__)
+
+STREAM_KEY = "core:leads"
+GROUP = "leads"
+# Хвост очереди на случай, если потребитель долго не работает
+STREAM_MAXLEN = 100_000
+DEAD_LETTER_KEY = "core:leads:dead"
+
+_client = None
+
+
+def get_client():
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(settings.LEADS_REDIS_URL, socket_timeout=2, socket_connect_timeout=2)
+    return _client
+
+
+def idempotency_key(data, client_key=""):
+    """Ключ из формы (генерирует JS) или отпечаток содержимого за день.
+
+    Отпечаток ловит двойную отправку без JS: та же заявка от того же
+    человека в тот же день считается одной.
+    """
+    if client_key:
+        return hashlib.sha256(f"client:{client_key}".encode()).hexdigest()
+    fingerprint = json.dumps([timezone.localdate().isoformat(), sorted(data.items())], ensure_ascii=False)
+    return hashlib.sha256(fingerprint.encode()).hexdigest()
+
+
+def save_leads(leads):
+    """Записать заявки; дубли по idempotency_key пропускаются."""
+    contact_requests = [ContactRequest(**lead) for lead in leads]
+    # bulk_create не вызывает save()
+    for contact_request in contact_requests:
+        contact_request.fill_identity()
+    ContactRequest.objects.bulk_create(contact_requests, ignore_conflicts=True)
+    notify_new_leads([lead["idempotency_key"] for lead in leads])
+
+
+def submit_lead(data, client_key=""):
+    """Принять проверенную заявку: в очередь или, если её нет, сразу в базу."""
+    lead = dict(data, idempotency_key=idempotency_key(data, client_key))
+    if settings.LEADS_REDIS_URL:
+        try:
+            get_client().xadd(
+                STREAM_KEY,
+                {"lead": json.dumps(lead, ensure_ascii=False)},
+                maxlen=STREAM_MAXLEN,
+                approximate=True,
+            )
+            return
+        except redis.RedisError:
+            logger.exception("Lead queue unavailable, saving synchronously")
+    save_leads([lead])
+
+
+def ensure_group(client):
+    try:
+        client.xgroup_create(STREAM_KEY, GROUP, id="0", mkstream=True)
+    except redis.ResponseError as exc:
+        if "BUSYGROUP" not in str(exc):
+            raise
+
+
+def consumer_name():
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def acknowledge(client, ids):
+    if ids:
+        client.xack(STREAM_KEY, GROUP, *ids)
+        client.xdel(STREAM_KEY, *ids)
+
+
+def delivery_count(client, message_id):
+    """Сколько раз сообщение выдавалось потребителям (XPENDING)."""
+    pending = client.xpending_range(STREAM_KEY, GROUP, min=message_id, max=message_id, count=1)
+    return pending[0]["times_delivered"] if pending else 1
+
+
+def dead_letter(client, message_id, fields, error):
+    """Перенести сообщение в DEAD_LETTER_KEY и убрать из очереди."""
+    logger.error("Lead message %s moved to %s: %s", message_id, DEAD_LETTER_KEY, error)
+    client.xadd(
+        DEAD_LETTER_KEY,
+        dict(fields, message_id=message_id, error=error),
+        maxlen=STREAM_MAXLEN,
+        approximate=True,
+    )
+    acknowledge(client, [message_id])
+
+
+def save_one_by_one(client, parsed):
+    """Пачка не сохранилась — каждая заявка отдельно. Возвращает число сохранённых."""
+    saved = []
+    for message_id, fields, lead in parsed:
+        try:
+            with transaction.atomic():
+                save_leads([lead])
+        except Exception as exc:
+            if delivery_count(client, message_id) >= settings.LEADS_MAX_DELIVERIES:
+                dead_letter(client, message_id, fields, repr(exc))
+            else:
+                # Без XACK: вернётся через XAUTOCLAIM
+                logger.exception("Lead message %s failed, will retry", message_id)
+        else:
+            saved.append(message_id)
+    acknowledge(client, saved)
+    return len(saved)
+
+
+def process_batch(client, messages):
+    parsed = []
+    empty = []
+    for message_id, fields in messages:
+        # Удалённое из stream приходит из XAUTOCLAIM без полей
+        if not fields:
+            empty.append(message_id)
+            continue
+        try:
+            lead = json.loads(fields[b"lead"])
+        except (KeyError, ValueError) as exc:
+            dead_letter(client, message_id, fields, repr(exc))
+            continue
+        parsed.append((message_id, fields, lead))
+    acknowledge(client, empty)
+    if not parsed:
+        return 0
+
+    try:
+        with transaction.atomic():
+            save_leads([lead for _, _, lead in parsed])
+    except Exception:
+        logger.exception("Lead batch failed, saving messages one by one")
+    else:
+        acknowledge(client, [message_id for message_id, _, _ in parsed])
+        return len(parsed)
+    return save_one_by_one(client, parsed)
+
+
+def consume_leads(batch_size=None, block_ms=1000, consumer=None):
+    """Один проход потребителя. Возвращает число обработанных заявок."""
+    client = get_client()
+    consumer = consumer or consumer_name()
+    batch_size = batch_size or settings.LEADS_BATCH_SIZE
+    ensure_group(client)
+
+    # Сначала — зависшие у упавших потребителей
+    _, claimed, *_ = client.xautoclaim(
+        STREAM_KEY, GROUP, consumer, min_idle_time=settings.LEADS_CLAIM_IDLE_MS, count=batch_size
+    )
+    processed = process_batch(client, claimed)
+
+    response = client.xreadgroup(GROUP, consumer, {STREAM_KEY: ">"}, count=batch_size, block=block_ms)
+    for _, messages in response or ():
+        processed += process_batch(client, messages)
+    return processed
@@ -0,0 +1,41 @@
+import time
+
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from core.admin_mixins import LargeTableAdminMixin
+
+
+class Command(BaseCommand):
+    help = "Число запросов и время списков админки для больших таблиц (должно не расти с числом строк)"
+
+    def handle(self, *args, **options):
+        factory = RequestFactory()
+        # Несохранённый суперпользователь: права есть, в базу не пишем
+        user = get_user_model()(is_active=True, is_staff=True, is_superuser=True)
+
+        for model, model_admin in admin.site._registry.items():
+            if not isinstance(model_admin, LargeTableAdminMixin):
+                continue
+            label = model._meta.label
+            self.stdout.write(f"{label}: {model._default_manager.count()} строк")
+
+            url = ""
+            for title in ("первая страница", "следующая страница (по ключу)"):
+                request = factory.get(f"/admin/{url}")
+                request.user = user
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.monotonic()
+                    response = model_admin.changelist_view(request)
+                    response.render()
+                    elapsed = (time.monotonic() - started) * 1000
+                self.stdout.write(f"  {title}: {len(queries)} запросов, {elapsed:.0f} мс")
+
+                changelist = response.context_data["cl"]
+                if not changelist.next_page_url:
+                    break
+                url = changelist.next_page_url
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from core.identity import IDENTITY_FIELDS
+from core.models import ContactRequest
+
+
+class Command(BaseCommand):
+    help = "Заполнить нормализованные телефон, email и Telegram у старых заявок (пачками по id)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        fields = list(IDENTITY_FIELDS.values())
+        last_pk = 0
+        total = 0
+        while True:
+            # По диапазону id, а не OFFSET: каждая пачка — короткий запрос по индексу
+            batch = list(
+                ContactRequest.objects.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .only("pk", *IDENTITY_FIELDS, *fields)[:batch_size]
+            )
+            if not batch:
+                break
+            for contact_request in batch:
+                contact_request.fill_identity()
+            ContactRequest.objects.bulk_update(batch, fields)
+            last_pk = batch[-1].pk
+            total += len(batch)
+            self.stdout.write(f"Обработано заявок: {total}")
+        self.stdout.write(self.style.SUCCESS(f"Готово: {total}"))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from core.images import pending_variant_fields
+from core.signals import RESPONSIVE_IMAGE_MODELS
+from core.tasks import generate_image_variants
+
+
+class Command(BaseCommand):
+    help = "Нарезать WebP/AVIF-варианты для уже загруженных картинок"
+
+    def handle(self, *args, **options):
+        total = 0
+        for model in RESPONSIVE_IMAGE_MODELS:
+            for instance in model.objects.iterator():
+                if pending_variant_fields(instance):
+                    generate_image_variants(model._meta.label, instance.pk)
+                    total += 1
+        self.stdout.write(self.style.SUCCESS(f"Обработано объектов: {total}"))
@@ -0,0 +1,20 @@
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+
+from core.cache import get_counters
+
+COUNTERS = ("fills", "stale_hits", "fill_waits")
+
+
+class Command(BaseCommand):
+    help = "Счётчики кэша: пересборки страниц, устаревшие выдачи, попадания по уровням"
+
+    def handle(self, *args, **options):
+        for name, value in get_counters(COUNTERS).items():
+            self.stdout.write(f"{name}: {value}")
+
+        # Двухуровневый бэкенд считает попадания в памяти процесса — здесь видны
+        # только обращения самой команды, у воркеров свои цифры
+        if hasattr(cache, "stats"):
+            for name, value in cache.stats().items():
+                self.stdout.write(f"{name}: {value}")
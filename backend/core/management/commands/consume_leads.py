@@ -0,0 +1,43 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core.leads import consume_leads
+
+logger = logging.getLogger(__name__)
+# Пауза после сбоя (Redis или база недоступны), чтобы не крутиться вхолостую
+ERROR_PAUSE = 5
+
+
+class Command(BaseCommand):
+    help = "Записывать заявки из очереди Redis в базу (работает постоянно)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Разобрать очередь один раз и выйти")
+
+    def handle(self, *args, **options):
+        if options["once"]:
+            total = 0
+            while True:
+                processed = consume_leads(block_ms=None)
+                if not processed:
+                    break
+                total += processed
+            self.stdout.write(self.style.SUCCESS(f"Сохранено заявок: {total}"))
+            return
+
+        while True:
+            # Процесс живёт долго — не держим соединение с базой дольше CONN_MAX_AGE
+            close_old_connections()
+            try:
+                processed = consume_leads()
+            except Exception:
+                # Ошибки отдельных заявок разбирает process_batch; здесь — сбой
+                # Redis или базы, после которого потребитель продолжает работу
+                logger.exception("Lead consumer pass failed")
+                time.sleep(ERROR_PAUSE)
+                continue
+            if processed:
+                self.stdout.write(f"Сохранено заявок: {processed}")
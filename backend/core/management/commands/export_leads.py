@@ -0,0 +1,41 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.exports import iter_csv, leads_queryset, write_xlsx
+
+
+class Command(BaseCommand):
+    help = "Выгрузить заявки в CSV или XLSX (с фильтрами по источнику, статусу и датам)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--source", help="Только этот источник")
+        status = parser.add_mutually_exclusive_group()
+        status.add_argument("--processed", dest="is_processed", action="store_true", default=None)
+        status.add_argument("--unprocessed", dest="is_processed", action="store_false")
+        parser.add_argument("--from", dest="date_from", type=date.fromisoformat, help="С даты (ГГГГ-ММ-ДД)")
+        parser.add_argument("--to", dest="date_to", type=date.fromisoformat, help="По дату включительно")
+        parser.add_argument("--format", choices=["csv", "xlsx"], default="csv")
+        parser.add_argument("--output", "-o", help="Файл; без него CSV пишется в stdout")
+
+    def handle(self, *args, **options):
+        queryset = leads_queryset(
+            source=options["source"],
+            is_processed=options["is_processed"],
+            date_from=options["date_from"],
+            date_to=options["date_to"],
+        )
+
+        if options["format"] == "xlsx":
+            if not options["output"]:
+                raise CommandError("Для XLSX укажите --output")
+            with open(options["output"], "wb") as file:
+                write_xlsx(queryset, file)
+            return
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8", newline="") as file:
+                file.writelines(iter_csv(queryset))
+        else:
+            for chunk in iter_csv(queryset):
+                self.stdout.write(chunk, ending="")
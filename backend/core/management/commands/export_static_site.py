@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+
+from core.static_export import export_site
+
+
+class Command(BaseCommand):
+    help = "Выгрузить публичные страницы в HTML (+ .gz) для отдачи через nginx"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", default=settings.STATIC_EXPORT_ROOT, help="Куда выгружать")
+        parser.add_argument("--full", action="store_true", help="Перезаписать все файлы, не сверяясь с manifest.json")
+
+    def handle(self, *args, **options):
+        if not options["output"]:
+            raise CommandError("Укажите --output или STATIC_EXPORT_ROOT")
+
+        try:
+            written, unchanged, removed = export_site(options["output"], full=options["full"])
+        except ImproperlyConfigured as exc:
+            raise CommandError(exc)
+        self.stdout.write(self.style.SUCCESS(
+            f"Записано: {written}, без изменений: {unchanged}, удалено: {removed}"
+        ))
@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.leads import GROUP, STREAM_KEY, get_client
+from core.ratelimit import get_metrics
+
+
+class Command(BaseCommand):
+    help = "Счётчики приёма заявок: принято, отсечено лимитом, дубли; длина очереди"
+
+    def handle(self, *args, **options):
+        if not settings.LEADS_REDIS_URL:
+            raise CommandError("LEADS_REDIS_URL не задан — заявки пишутся сразу, счётчиков нет")
+
+        for name, value in get_metrics().items():
+            self.stdout.write(f"{name}: {value}")
+
+        client = get_client()
+        self.stdout.write(f"queue_length: {client.xlen(STREAM_KEY)}")
+        groups = {g["name"].decode(): g for g in client.xinfo_groups(STREAM_KEY)} if client.exists(STREAM_KEY) else {}
+        if GROUP in groups:
+            self.stdout.write(f"queue_pending: {groups[GROUP]['pending']}")
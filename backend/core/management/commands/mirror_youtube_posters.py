@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from core.models import VideoReview
+from core.youtube import mirror_posters
+
+
+class Command(BaseCommand):
+    help = "Скачать обложки YouTube для видео-отзывов без своей обложки"
+
+    def handle(self, *args, **options):
+        saved = mirror_posters(VideoReview.objects.filter(poster="").exclude(youtube_id=""))
+        self.stdout.write(self.style.SUCCESS(f"Сохранено обложек: {saved}"))
@@ -0,0 +1,93 @@
+import random
+import statistics
+import time
+
+from django.contrib import admin
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Max
+
+from core.models import ContactRequest
+from core.search import get_search_backend
+
+SOURCE = "benchmark"
+BATCH_SIZE = 5000
+NAMES = ["Анна", "Борис", "Виктория", "Глеб", "Дарья", "Егор", "Жанна", "Игорь", "Ксения", "Леонид"]
+SURNAMES = ["Иванова", "Петров", "Смирнова", "Кузнецов", "Попова", "Соколов", "Лебедева", "Новиков"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Время поиска по заявкам в админке на большой таблице. Пишет тестовые заявки "
+        "(source=benchmark) в настроенную базу и удаляет их после замера"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000, help="Сколько заявок должно быть в таблице")
+        parser.add_argument("--term", action="append", help="Поисковая строка (можно несколько)")
+        parser.add_argument("--repeat", type=int, default=20, help="Повторов на строку")
+        parser.add_argument(
+            "--i-know-this-writes-to-the-database",
+            action="store_true",
+            dest="confirmed",
+            help="Подтверждение: команда добавляет заявки в базу из настроек (запускайте на копии, не на проде)",
+        )
+
+    def seed(self, rows):
+        missing = rows - ContactRequest.objects.count()
+        if missing <= 0:
+            return
+        self.stdout.write(f"Добавляем {missing} заявок…")
+        rng = random.Random(0)
+        while missing > 0:
+            batch = []
+            for _ in range(min(BATCH_SIZE, missing)):
+                number = rng.randrange(10 ** 9)
+                batch.append(ContactRequest(
+                    name=f"{rng.choice(NAMES)} {rng.choice(SURNAMES)}",
+                    phone=f"+7 9{number:09d}",
+                    email=f"user{number}@example.com",
+                    source=SOURCE,
+                ))
+            ContactRequest.objects.bulk_create(batch)
+            missing -= len(batch)
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(f"ANALYZE {ContactRequest._meta.db_table}")
+
+    def handle(self, *args, **options):
+        if not options["confirmed"]:
+            raise CommandError(
+                f"Команда запишет до {options['rows']} заявок в базу {connection.settings_dict['NAME']}. "
+                "Запустите на копии базы с --i-know-this-writes-to-the-database"
+            )
+
+        # Удаляем только добавленное этим запуском — даже если замер упал или его прервали
+        last_pk = ContactRequest.objects.aggregate(last=Max("pk"))["last"] or 0
+        try:
+            self.seed(options["rows"])
+            self.measure(options)
+        finally:
+            deleted, _ = ContactRequest.objects.filter(source=SOURCE, pk__gt=last_pk).delete()
+            self.stdout.write(f"Удалено тестовых заявок: {deleted}")
+
+    def measure(self, options):
+        backend = get_search_backend()
+        fields = admin.site._registry[ContactRequest].search_fields
+        self.stdout.write(f"{type(backend).__name__}, {ContactRequest.objects.count()} строк, поля: {', '.join(fields)}")
+
+        for term in options["term"] or ["Смирнова", "user12345", "9161"]:
+            queryset = backend.search(ContactRequest.objects.all(), fields, term)
+            if backend.ranked:
+                queryset = queryset.order_by("-search_rank", "-pk")
+            page = queryset[:100]
+            timings = []
+            for _ in range(options["repeat"]):
+                started = time.monotonic()
+                list(page.all())
+                timings.append((time.monotonic() - started) * 1000)
+            timings.sort()
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            self.stdout.write(f"  «{term}»: медиана {statistics.median(timings):.1f} мс, p95 {p95:.1f} мс")
+            if connection.vendor == "postgresql" and options["verbosity"] > 1:
+                self.stdout.write(page.explain(analyze=True))
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_alter_sitesettings_contact_address_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='popup',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Варианты изображений'),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Варианты изображений'),
+        ),
+        migrations.AddField(
+            model_name='videoreview',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Варианты изображений'),
+        ),
+        migrations.AddField(
+            model_name='whyspanishitem',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Варианты изображений'),
+        ),
+    ]
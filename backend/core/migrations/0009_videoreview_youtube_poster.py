@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='videoreview',
+            name='youtube_poster',
+            field=models.ImageField(blank=True, editable=False, upload_to='video_reviews/youtube/', verbose_name='Копия обложки с YouTube'),
+        ),
+    ]
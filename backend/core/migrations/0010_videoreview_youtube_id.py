@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_videoreview_youtube_poster'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='videoreview',
+            name='youtube_id',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=11, verbose_name='YouTube ID'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+import re
+
+from django.db import migrations
+
+# Копия core.models.YOUTUBE_ID_RE на момент миграции
+YOUTUBE_ID_RE = re.compile(
+    r'(?:youtube\.com/(?:watch\?(?:[^#]*&)?v=|shorts/|embed/|live/)|youtu\.be/)([A-Za-z0-9_-]{11})(?![A-Za-z0-9_-])'
+)
+
+
+def backfill_youtube_id(apps, schema_editor):
+    VideoReview = apps.get_model('core', 'VideoReview')
+    changed = []
+    for video_review in VideoReview.objects.only('pk', 'youtube_url').iterator():
+        match = YOUTUBE_ID_RE.search(video_review.youtube_url or '')
+        video_review.youtube_id = match.group(1) if match else ''
+        if video_review.youtube_id:
+            changed.append(video_review)
+    VideoReview.objects.bulk_update(changed, ['youtube_id'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_videoreview_youtube_id'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_youtube_id, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_backfill_videoreview_youtube_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contactrequest',
+            name='idempotency_key',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True, unique=True),
+        ),
+    ]
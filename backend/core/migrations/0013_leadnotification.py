@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:33
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_contactrequest_idempotency_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeadNotification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('channel', models.CharField(choices=[('telegram', 'Telegram'), ('email', 'Email')], max_length=10, verbose_name='Канал')),
+                ('status', models.CharField(choices=[('pending', 'Ожидает отправки'), ('sent', 'Отправлено'), ('failed', 'Не доставлено')], default='pending', max_length=10, verbose_name='Статус')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Попыток')),
+                ('last_error', models.TextField(blank=True, verbose_name='Последняя ошибка')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='Отправлено')),
+                ('contact_request', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to='core.contactrequest', verbose_name='Заявка')),
+                ('popup', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to='core.popup', verbose_name='Popup окно')),
+            ],
+            options={
+                'verbose_name': 'Уведомление о заявке',
+                'verbose_name_plural': 'Уведомления о заявках',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'channel'], name='core_leadno_status_353f5f_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='leadnotification',
+            constraint=models.UniqueConstraint(fields=('contact_request', 'channel'), name='unique_lead_notification'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_leadnotification'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='contactrequest',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+    ]
@@ -0,0 +1,45 @@
+from django.db import migrations
+
+# (таблица, колонка) для поиска в админке; индексы только на PostgreSQL
+TRIGRAM_INDEXES = [
+    ('core_contactrequest', 'name'),
+    ('core_contactrequest', 'phone'),
+    ('core_contactrequest', 'email'),
+    ('core_review', 'user_name'),
+    ('core_review', 'text'),
+    ('core_faq', 'question'),
+    ('core_faq', 'answer'),
+    ('core_codesnippet', 'name'),
+    ('core_codesnippet', 'code'),
+]
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for table, column in TRIGRAM_INDEXES:
+        # icontains на PostgreSQL — UPPER("col"::text) LIKE UPPER(...):
+        # индекс строится по тому же выражению, иначе планировщик его не возьмёт
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {table}_{column}_trgm ON {table} '
+            f'USING gin ((UPPER({column}::text)) gin_trgm_ops)'
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {table}_{column}_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_contactrequest_created_at_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
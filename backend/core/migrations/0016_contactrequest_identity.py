@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contactrequest',
+            name='email_normalized',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=254),
+        ),
+        migrations.AddField(
+            model_name='contactrequest',
+            name='phone_normalized',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=16),
+        ),
+        migrations.AddField(
+            model_name='contactrequest',
+            name='telegram_normalized',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=32),
+        ),
+    ]
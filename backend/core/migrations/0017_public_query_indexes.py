@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_contactrequest_identity'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='codesnippet',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['location', 'order'], name='codesnippet_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='faq',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', '-created_at'], name='faq_active_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at'], name='review_active_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='videoreview',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', '-created_at'], name='videoreview_active_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='videoreview',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['course_type', 'order', '-created_at'], name='videoreview_active_course_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='whyspanishitem',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order'], name='whyspanish_active_order_idx'),
+        ),
+    ]
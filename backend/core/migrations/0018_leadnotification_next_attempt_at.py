@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:54
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_public_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='leadnotification',
+            name='core_leadno_status_353f5f_idx',
+        ),
+        migrations.AddField(
+            model_name='leadnotification',
+            name='next_attempt_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, verbose_name='Следующая попытка'),
+        ),
+        migrations.AddIndex(
+            model_name='leadnotification',
+            index=models.Index(fields=['status', 'next_attempt_at'], name='core_leadno_status_af2a2a_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:58
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_leadnotification_next_attempt_at'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='popup',
+            name='image_variants',
+        ),
+    ]
@@ -1,4 +1,40 @@
+import re
+
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.utils import timezone
+
+from .identity import IDENTITY_FIELDS, identity_of
+
+# watch?v=, youtu.be/, shorts/, embed/, live/ — ID всегда 11 символов
+YOUTUBE_ID_RE = re.compile(
+    r'(?:youtube\.com/(?:watch\?(?:[^#]*&)?v=|shorts/|embed/|live/)|youtu\.be/)([A-Za-z0-9_-]{11})(?![A-Za-z0-9_-])'
+)
+
+
+def extract_youtube_id(url):
+    """YouTube ID из ссылки на видео или '' для неподходящей ссылки."""
+    match = YOUTUBE_ID_RE.search(url or '')
+    return match.group(1) if match else ''
+
+
+class ResponsiveImagesMixin(models.Model):
+    """Модель с адаптивными вариантами картинок (см. core/images.py)."""
+    # Поля ImageField, для которых нарезаются варианты
+    responsive_image_fields = ()
+
+    image_variants = models.JSONField("Варианты изображений", default=dict, blank=True, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def variants_for(self, field_name):
+        """Варианты поля, если они нарезаны из текущего файла."""
+        variants = self.image_variants.get(field_name) or {}
+        field_file = getattr(self, field_name)
+        if not field_file or variants.get("source") != field_file.name:
+            return {}
+        return variants
 
 
 class ContactRequest(models.Model):
@@ -12,7 +48,17 @@ class ContactRequest(models.Model):
     source = models.CharField("Источник", max_length=100, blank=True)
     
     is_processed = models.BooleanField("Обработано", default=False)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    # Повторная отправка той же заявки (ретрай клиента, повторная доставка
+    # из очереди) не создаёт дубль, см. core/leads.py
+    idempotency_key = models.CharField(max_length=64, unique=True, null=True, blank=True, editable=False)
+
+    # Контакты в нормализованном виде для поиска заявок одного человека,
+    # см. core/identity.py
+    phone_normalized = models.CharField(max_length=16, blank=True, db_index=True, editable=False)
+    email_normalized = models.CharField(max_length=254, blank=True, db_index=True, editable=False)
+    telegram_normalized = models.CharField(max_length=32, blank=True, db_index=True, editable=False)
 
     class Meta:
         verbose_name = "Заявка"
@@ -22,6 +68,20 @@ class ContactRequest(models.Model):
     def __str__(self):
         return f"{self.name} - {self.created_at:%d.%m.%Y}"
 
+    def fill_identity(self):
+        for field, value in identity_of(self).items():
+            setattr(self, IDENTITY_FIELDS[field], value)
+
+    def save(self, *args, **kwargs):
+        self.fill_identity()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {
+                *update_fields,
+                *(IDENTITY_FIELDS[field] for field in IDENTITY_FIELDS if field in update_fields),
+            }
+        super().save(*args, **kwargs)
+
 
 class FAQ(models.Model):
     """Вопросы и ответы"""
@@ -38,6 +98,10 @@ class FAQ(models.Model):
         verbose_name = "Вопрос-ответ"
         verbose_name_plural = "Вопросы и ответы"
         ordering = ["order", "-created_at"]
+        # Частичные индексы под публичные выборки: только активные записи в порядке вывода
+        indexes = [
+            models.Index(fields=["order", "-created_at"], condition=models.Q(is_active=True), name="faq_active_order_idx"),
+        ]
 
     def __str__(self):
         return self.question[:50]
@@ -106,6 +170,9 @@ class CodeSnippet(models.Model):
         verbose_name = "Сниппет кода"
         verbose_name_plural = "Сниппеты кода"
         ordering = ["location", "order"]
+        indexes = [
+            models.Index(fields=["location", "order"], condition=models.Q(is_active=True), name="codesnippet_active_idx"),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.get_location_display()})"
@@ -113,6 +180,7 @@ class CodeSnippet(models.Model):
 
 class Popup(models.Model):
     """Кастомные popup окна"""
+
     name = models.CharField("Название (для админки)", max_length=100)
     slug = models.SlugField("Код popup", unique=True, help_text="Используется в data-popup='#popup-{slug}'")
     
@@ -212,8 +280,10 @@ class HeaderButton(models.Model):
         return self.name
 
 
-class Review(models.Model):
+class Review(ResponsiveImagesMixin):
     """Отзывы студентов"""
+    responsive_image_fields = ("user_avatar",)
+
     user_name = models.CharField("Имя", max_length=100)
     user_avatar = models.ImageField("Аватар (файл)", upload_to="reviews/", blank=True)
     user_avatar_url = models.URLField("Или URL аватара", blank=True)
@@ -230,6 +300,9 @@ class Review(models.Model):
         verbose_name = "Отзыв"
         verbose_name_plural = "Отзывы"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["-created_at"], condition=models.Q(is_active=True), name="review_active_created_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user_name} — {self.rating}★"
@@ -240,7 +313,9 @@ class Review(models.Model):
         return self.user_avatar_url or ''
     
 
-class WhySpanishItem(models.Model):
+class WhySpanishItem(ResponsiveImagesMixin):
+    responsive_image_fields = ("image", "video_poster")
+
     MEDIA_TYPE_CHOICES = [
         ('image', 'Изображение'),
         ('video', 'Видео'),
@@ -260,13 +335,18 @@ class WhySpanishItem(models.Model):
         ordering = ['order']
         verbose_name = 'Преимущество испанского'
         verbose_name_plural = 'Преимущества испанского'
+        indexes = [
+            models.Index(fields=["order"], condition=models.Q(is_active=True), name="whyspanish_active_order_idx"),
+        ]
 
     def __str__(self):
         return self.title
     
 
-class VideoReview(models.Model):
+class VideoReview(ResponsiveImagesMixin):
     """Видео-отзывы студентов"""
+    responsive_image_fields = ("user_avatar", "poster")
+
     COURSE_TYPE_CHOICES = [
         ('all', 'Все страницы'),
         ('activo', 'Español Activo'),
@@ -286,7 +366,12 @@ class VideoReview(models.Model):
         help_text="На какой странице курса показывать"
     )
     youtube_url = models.URLField("Ссылка на YouTube видео")
+    # Заполняется в save() из youtube_url
+    youtube_id = models.CharField("YouTube ID", max_length=11, blank=True, db_index=True, editable=False)
     poster = models.ImageField("Обложка (если нет — возьмётся с YouTube)", upload_to="video_reviews/posters/", blank=True)
+    youtube_poster = models.ImageField(
+        "Копия обложки с YouTube", upload_to="video_reviews/youtube/", blank=True, editable=False
+    )
     order = models.PositiveIntegerField("Порядок", default=0)
     is_active = models.BooleanField("Активен", default=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -296,6 +381,11 @@ class VideoReview(models.Model):
         verbose_name = "Видео-отзыв"
         verbose_name_plural = "Видео-отзывы"
         ordering = ["order", "-created_at"]
+        indexes = [
+            models.Index(fields=["order", "-created_at"], condition=models.Q(is_active=True), name="videoreview_active_order_idx"),
+            # Отзывы одного курса (и «Все страницы») в порядке вывода
+            models.Index(fields=["course_type", "order", "-created_at"], condition=models.Q(is_active=True), name="videoreview_active_course_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user_name} — {self.course_name}"
@@ -305,23 +395,70 @@ class VideoReview(models.Model):
             return self.user_avatar.url
         return self.user_avatar_url or ''
 
+    def clean(self):
+        super().clean()
+        if self.youtube_url and not extract_youtube_id(self.youtube_url):
+            raise ValidationError({"youtube_url": "Не удалось распознать ссылку на видео YouTube"})
+
+    def save(self, *args, **kwargs):
+        self.youtube_id = extract_youtube_id(self.youtube_url)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "youtube_url" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "youtube_id"}
+        super().save(*args, **kwargs)
+
     def get_youtube_id(self):
-        """Извлекает YouTube ID из URL"""
-        import re
-        patterns = [
-            r'(?:youtube\.com/watch\?v=|youtu\.be/|youtube\.com/shorts/)([^&\n?#]+)',
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, self.youtube_url)
-            if match:
-                return match.group(1)
-        return ''
+        return self.youtube_id
 
     def get_poster(self):
+        from .youtube import is_mirrored
+
         if self.poster:
             return self.poster.url
+        if is_mirrored(self):
+            return self.youtube_poster.url
         yt_id = self.get_youtube_id()
         if yt_id:
             return f"https://img.youtube.com/vi/{yt_id}/hqdefault.jpg"
         return ''
     
+
+
+class LeadNotification(models.Model):
+    """Уведомление о заявке из popup (Telegram или email), см. core/notifications.py"""
+
+    class Channel(models.TextChoices):
+        TELEGRAM = "telegram", "Telegram"
+        EMAIL = "email", "Email"
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Ожидает отправки"
+        SENT = "sent", "Отправлено"
+        FAILED = "failed", "Не доставлено"
+
+    contact_request = models.ForeignKey(
+        ContactRequest, on_delete=models.CASCADE, related_name="notifications", verbose_name="Заявка"
+    )
+    popup = models.ForeignKey(Popup, on_delete=models.CASCADE, related_name="notifications", verbose_name="Popup окно")
+    channel = models.CharField("Канал", max_length=10, choices=Channel.choices)
+    status = models.CharField("Статус", max_length=10, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField("Попыток", default=0)
+    last_error = models.TextField("Последняя ошибка", blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField("Отправлено", null=True, blank=True)
+    # После неудачи — не раньше этого времени (экспоненциальная пауза)
+    next_attempt_at = models.DateTimeField("Следующая попытка", default=timezone.now)
+
+    class Meta:
+        verbose_name = "Уведомление о заявке"
+        verbose_name_plural = "Уведомления о заявках"
+        ordering = ["-created_at"]
+        constraints = [
+            models.UniqueConstraint(fields=["contact_request", "channel"], name="unique_lead_notification"),
+        ]
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.contact_request} → {self.get_channel_display()}"
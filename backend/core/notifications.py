@@ -0,0 +1,261 @@
+"""
+Уведомления о заявках из popup-окон.
+
+Заявка с source="popup-<slug>" получает по записи LeadNotification на
+каждый канал, настроенный в этом popup. Отправляет их Celery-задача
+dispatch_lead_notifications, а не веб-воркер:
+
+- всё, что накопилось за LEAD_NOTIFY_DELAY, уходит одной сводкой на чат
+  или адрес;
+- в один чат Telegram — не чаще раза в TELEGRAM_CHAT_INTERVAL (и с учётом
+  retry_after из ответа 429), остальное ждёт следующего прохода;
+- HTTP-сессия с пулом соединений — одна на токен бота, письма всей пачки
+  уходят через одно SMTP-соединение.
+- после неудачи уведомление ждёт до next_attempt_at (пауза удваивается),
+  после MAX_ATTEMPTS попыток помечается FAILED.
+
+Адрес Telegram API задаётся TELEGRAM_API_URL, SMTP — обычными EMAIL_*,
+так что в тестах подставляются локальные заглушки.
+"""
+import logging
+import time
+from collections import defaultdict
+from datetime import timedelta
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Min
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
+
+from .models import ContactRequest, LeadNotification, Popup
+
+logger = logging.getLogger(__name__)
+
+POPUP_SOURCE_PREFIX = "popup-"
+SCHEDULED_KEY = "core:notify:scheduled"
+LOCK_KEY = "core:notify:lock"
+LOCK_TIMEOUT = 60 * 5
+CHAT_NEXT_KEY = "core:notify:chat:{}:{}"
+
+# Сводка длиннее лимита Telegram (4096 символов) делится на несколько сообщений
+LEADS_PER_MESSAGE = 15
+MAX_ATTEMPTS = 5
+LOCK_BUSY_RETRY = 30
+SEND_TIMEOUT = 10
+
+_sessions = {}
+
+
+def get_telegram_session(token):
+    """Постоянная сессия на бота: TLS-соединение с API переиспользуется."""
+    session = _sessions.get(token)
+    if session is None:
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        _sessions[token] = session
+    return session
+
+
+# ----- постановка -----
+
+def notify_new_leads(idempotency_keys):
+    """Завести уведомления для только что сохранённых заявок из popup."""
+    contact_requests = ContactRequest.objects.filter(
+        idempotency_key__in=idempotency_keys,
+        source__startswith=POPUP_SOURCE_PREFIX,
+        notifications__isnull=True,
+    )
+    slugs = {cr.source[len(POPUP_SOURCE_PREFIX):] for cr in contact_requests}
+    if not slugs:
+        return
+    popups = {popup.slug: popup for popup in Popup.objects.filter(slug__in=slugs)}
+
+    notifications = []
+    for cr in contact_requests:
+        popup = popups.get(cr.source[len(POPUP_SOURCE_PREFIX):])
+        if popup is None:
+            continue
+        if popup.telegram_bot_token and popup.telegram_chat_id:
+            notifications.append(LeadNotification(contact_request=cr, popup=popup, channel=LeadNotification.Channel.TELEGRAM))
+        if popup.notification_email:
+            notifications.append(LeadNotification(contact_request=cr, popup=popup, channel=LeadNotification.Channel.EMAIL))
+    if notifications:
+        LeadNotification.objects.bulk_create(notifications, ignore_conflicts=True)
+        schedule_dispatch()
+
+
+def schedule_dispatch(countdown=None):
+    """Поставить отправку; заявки, пришедшие до её запуска, попадут в ту же сводку."""
+    countdown = settings.LEAD_NOTIFY_DELAY if countdown is None else countdown
+
+    def enqueue():
+        from .tasks import dispatch_lead_notifications
+
+        if not cache.add(SCHEDULED_KEY, 1, countdown + LOCK_TIMEOUT):
+            return
+        try:
+            dispatch_lead_notifications.apply_async(countdown=countdown)
+        except Exception:
+            cache.delete(SCHEDULED_KEY)
+            logger.exception("Failed to schedule lead notifications")
+
+    transaction.on_commit(enqueue)
+
+
+# ----- текст -----
+
+def format_lead(number, contact_request):
+    lines = [f"{number}. {contact_request.name}"]
+    for label, value in (
+        ("Телефон", contact_request.phone),
+        ("Email", contact_request.email),
+        ("Telegram", contact_request.telegram),
+        ("Сообщение", contact_request.message),
+    ):
+        if value:
+            lines.append(f"{label}: {value}")
+    lines.append(timezone.localtime(contact_request.created_at).strftime("%d.%m.%Y %H:%M"))
+    return "\n".join(lines)
+
+
+def format_digest(notifications):
+    popup_names = sorted({n.popup.name for n in notifications})
+    header = f"Новые заявки: {len(notifications)} ({', '.join(popup_names)})"
+    body = "\n\n".join(format_lead(i, n.contact_request) for i, n in enumerate(notifications, 1))
+    return f"{header}\n\n{body}"
+
+
+# ----- состояние -----
+
+def mark_sent(notifications):
+    LeadNotification.objects.filter(pk__in=[n.pk for n in notifications]).update(
+        status=LeadNotification.Status.SENT, sent_at=timezone.now(), last_error=""
+    )
+
+
+def mark_failed(notifications, error):
+    """Засчитать неудачную попытку; возвращает паузу до следующей.
+
+    Пауза записывается в next_attempt_at: проходы, запущенные раньше
+    (новая заявка, beat), эти уведомления не трогают.
+    """
+    attempts = max(n.attempts for n in notifications) + 1
+    status = LeadNotification.Status.FAILED if attempts >= MAX_ATTEMPTS else LeadNotification.Status.PENDING
+    delay = 30 * 2 ** attempts
+    LeadNotification.objects.filter(pk__in=[n.pk for n in notifications]).update(
+        attempts=attempts,
+        status=status,
+        last_error=str(error)[:1000],
+        next_attempt_at=timezone.now() + timedelta(seconds=delay),
+    )
+    logger.warning("Lead notification failed (attempt %s): %s", attempts, error)
+    return delay
+
+
+# ----- отправка -----
+
+def send_telegram(token, chat_id, notifications):
+    """Одно сообщение в чат, если лимит чата позволяет.
+
+    Возвращает, через сколько секунд нужен следующий проход (или None).
+    """
+    chat_key = CHAT_NEXT_KEY.format(token.split(":", 1)[0], chat_id)
+    now = time.time()
+    next_at = cache.get(chat_key)
+    if next_at and next_at > now:
+        return next_at - now
+
+    chunk = notifications[:LEADS_PER_MESSAGE]
+    try:
+        response = get_telegram_session(token).post(
+            f"{settings.TELEGRAM_API_URL}/bot{token}/sendMessage",
+            json={"chat_id": chat_id, "text": format_digest(chunk), "disable_web_page_preview": True},
+            timeout=SEND_TIMEOUT,
+        )
+        if response.status_code == 429:
+            retry_after = response.json().get("parameters", {}).get("retry_after", settings.TELEGRAM_CHAT_INTERVAL)
+            cache.set(chat_key, now + retry_after, retry_after + 1)
+            return retry_after
+        response.raise_for_status()
+    except (requests.RequestException, ValueError) as exc:
+        return mark_failed(chunk, exc)
+
+    mark_sent(chunk)
+    interval = settings.TELEGRAM_CHAT_INTERVAL
+    cache.set(chat_key, now + interval, interval + 1)
+    return interval if len(notifications) > len(chunk) else None
+
+
+def send_emails(groups):
+    """Сводки по адресам через одно SMTP-соединение. groups: {email: [уведомления]}."""
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as exc:
+        return min(mark_failed(notifications, exc) for notifications in groups.values())
+
+    retry_in = None
+    try:
+        for address, notifications in groups.items():
+            message = EmailMessage(
+                subject=f"Новые заявки: {len(notifications)}",
+                body=format_digest(notifications),
+                to=[address],
+                connection=connection,
+            )
+            try:
+                message.send()
+            except Exception as exc:
+                wait = mark_failed(notifications, exc)
+                retry_in = wait if retry_in is None else min(retry_in, wait)
+            else:
+                mark_sent(notifications)
+    finally:
+        connection.close()
+    return retry_in
+
+
+def dispatch_pending():
+    """Отправить всё, чему пора. Возвращает паузу до следующего прохода или None."""
+    if not cache.add(LOCK_KEY, 1, LOCK_TIMEOUT):
+        # Уже отправляет другой воркер. Уведомления, записанные после начала
+        # его прохода, он не увидит — поэтому просим повторить проход позже
+        return LOCK_BUSY_RETRY
+    now = timezone.now()
+    try:
+        pending = (
+            LeadNotification.objects
+            .filter(status=LeadNotification.Status.PENDING, next_attempt_at__lte=now)
+            .select_related("contact_request", "popup")
+            .order_by("created_at")
+        )
+        telegram = defaultdict(list)
+        emails = defaultdict(list)
+        for notification in pending:
+            popup = notification.popup
+            if notification.channel == LeadNotification.Channel.TELEGRAM:
+                telegram[(popup.telegram_bot_token, popup.telegram_chat_id)].append(notification)
+            else:
+                emails[popup.notification_email].append(notification)
+
+        waits = [send_telegram(token, chat_id, items) for (token, chat_id), items in telegram.items()]
+        if emails:
+            waits.append(send_emails(emails))
+        # Отложенные после неудачи — к их времени
+        deferred = (
+            LeadNotification.objects
+            .filter(status=LeadNotification.Status.PENDING, next_attempt_at__gt=now)
+            .aggregate(next_at=Min("next_attempt_at"))["next_at"]
+        )
+        if deferred is not None:
+            waits.append((deferred - now).total_seconds())
+    finally:
+        cache.delete(LOCK_KEY)
+
+    waits = [wait for wait in waits if wait is not None]
+    return min(waits) if waits else None
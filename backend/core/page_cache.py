@@ -0,0 +1,163 @@
+"""
+Кэш готовых страниц для анонимных GET-запросов.
+
+Ключ зависит от хоста, пути, языка (в страницах есть абсолютные
+ссылки — canonical, og:url) и только тех GET-параметров, которые читает
+сама view (query_params декоратора). Метки вроде utm_*, gclid, fbclid
+и случайные параметры от ботов не плодят отдельных копий; вместе со страницей хранятся
+версии моделей, из которых она построена. Сохранение модели в админке
+меняет её версию (см. signals.py), и устаревают только страницы, которые
+от неё зависят.
+"""
+import hashlib
+import re
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.utils.cache import get_conditional_response
+from django.utils.translation import get_language
+
+from .cache import bump_version, get_or_fill, get_versions, model_namespace
+from .chrome import CHROME_NAMESPACES
+
+# Общая версия всех страниц — для полной очистки из админки
+PAGES_NAMESPACE = "pages"
+PAGE_TIMEOUT = 60 * 15
+
+PAGE_KEY = "core:page:{}"
+CSRF_PLACEHOLDER = "__csrf_token__"
+CSRF_INPUT_RE = re.compile(r'(name="csrfmiddlewaretoken" value=")[^"]*(")')
+
+
+def purge_page_cache():
+    """Сбросить все закэшированные страницы."""
+    bump_version(PAGES_NAMESPACE)
+
+
+def page_namespaces(models):
+    return (PAGES_NAMESPACE,) + CHROME_NAMESPACES + tuple(model_namespace(m) for m in models)
+
+
+def page_query(request, query_params):
+    """Query string только из параметров, от которых зависит страница."""
+    return urlencode(
+        sorted((name, request.GET.getlist(name)) for name in query_params if name in request.GET),
+        doseq=True,
+    )
+
+
+def page_cache_key(request, query_params=()):
+    raw = "|".join([request.get_host(), request.path, get_language() or "", page_query(request, query_params)])
+    return PAGE_KEY.format(hashlib.md5(raw.encode()).hexdigest())
+
+
+def page_etag(request, versions, query_params=()):
+    """Валидатор страницы: хост, версии контента, язык, сборка и CSRF-cookie.
+
+    Считается без базы и без чтения самой страницы из кэша. CSRF-cookie
+    входит в хеш, чтобы после его смены браузер не остался со старым
+    токеном в формах.
+    """
+    raw = "|".join([
+        request.path,
+        page_query(request, query_params),
+        request.get_host(),
+        get_language() or "",
+        settings.BUILD_HASH,
+        request.COOKIES.get(settings.CSRF_COOKIE_NAME, ""),
+        *map(str, versions),
+    ])
+    return '"%s"' % hashlib.md5(raw.encode()).hexdigest()
+
+
+def is_cacheable_request(request):
+    if request.method not in ("GET", "HEAD"):
+        return False
+    if request.user.is_authenticated:
+        return False
+    # Flash-сообщение (например, после отправки заявки) — только для этого посетителя
+    return len(get_messages(request)) == 0
+
+
+def is_cacheable_response(response):
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+        and "private" not in response.get("Cache-Control", "")
+    )
+
+
+def entry_from_response(response):
+    # CSRF-токен свой у каждого посетителя — в кэше храним заглушку
+    content = CSRF_INPUT_RE.sub(rf"\g<1>{CSRF_PLACEHOLDER}\g<2>", response.content.decode(response.charset))
+    return {"content": content, "content_type": response["Content-Type"]}
+
+
+def response_from_entry(request, entry):
+    content = entry["content"]
+    if CSRF_PLACEHOLDER in content:
+        content = content.replace(CSRF_PLACEHOLDER, get_token(request))
+    response = HttpResponse(content, content_type=entry["content_type"])
+    response["X-Page-Cache"] = "hit"
+    return response
+
+
+def cache_public_page(*models, query_params=(), timeout=PAGE_TIMEOUT, serve_stale=False, conditional=True):
+    """Кэширует страницу для анонимов; models — от чего зависит контент.
+
+    query_params — GET-параметры, которые читает view; остальные в ключ
+    и ETag не входят.
+
+    serve_stale — пока один воркер пересобирает страницу после сброса,
+    остальные отдают предыдущую версию, а не собирают её все разом.
+    conditional — отдавать ETag и 304, если версии контента не менялись.
+    """
+    namespaces = page_namespaces(models)
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not is_cacheable_request(request):
+                return view(request, *args, **kwargs)
+
+            versions = get_versions(namespaces)
+            etag = page_etag(request, versions, query_params) if conditional else None
+            if etag is not None:
+                not_modified = get_conditional_response(request, etag=etag)
+                if not_modified is not None:
+                    return not_modified
+
+            response = None
+
+            def fill():
+                nonlocal response
+                response = view(request, *args, **kwargs)
+                if is_cacheable_response(response):
+                    return dict(entry_from_response(response), versions=versions)
+                return None
+
+            entry = get_or_fill(
+                page_cache_key(request, query_params),
+                fill,
+                versions=versions,
+                timeout=timeout,
+                serve_stale=serve_stale,
+            )
+            if response is None:
+                response = response_from_entry(request, entry)
+                # Устаревшая копия (serve_stale) получает свой ETag, иначе
+                # браузер закрепит её за текущими версиями
+                if etag is not None and entry["versions"] != versions:
+                    etag = page_etag(request, entry["versions"], query_params)
+            if etag is not None and response.status_code == 200:
+                response["ETag"] = etag
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,187 @@
+"""
+Ограничение частоты заявок и подавление дублей.
+
+Token bucket в Redis: на IP и на нормализованные телефон и email. Ведро
+пополняется равномерно, ёмкость и скорость задаются для каждого source
+в settings.LEAD_RATE_LIMITS. Проверка и списание всех вёдер заявки —
+один Lua-скрипт, поэтому параллельные запросы не обходят лимит.
+
+Повтор той же заявки в течение LEAD_DEDUP_WINDOW принимается молча, без
+записи (SET NX). Счётчики — в хеше core:leads:metrics (manage.py lead_stats).
+
+Без Redis, как и при его недоступности, заявки не ограничиваются.
+"""
+import hashlib
+import ipaddress
+import json
+import logging
+import time
+
+import redis
+from django.conf import settings
+
+from .identity import normalize_email, normalize_phone
+from .leads import get_client
+
+logger = logging.getLogger(__name__)
+
+BUCKET_KEY = "core:rl:{group}:{kind}:{value}"
+DEDUP_KEY = "core:leads:dedup:{}"
+METRICS_KEY = "core:leads:metrics"
+
+ALLOWED = "allowed"
+LIMITED = "limited"
+DUPLICATE = "duplicate"
+
+# KEYS — вёдра; ARGV: now (мс), затем по паре (ёмкость, токенов в секунду) на ведро.
+# Возвращает 0, если все вёдра дали токен, иначе секунды до появления токена
+TOKEN_BUCKET_LUA = """
+local now = tonumber(ARGV[1])
+local wait = 0
+local states = {}
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[i * 2])
+    local rate = tonumber(ARGV[i * 2 + 1])
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + (now - ts) / 1000 * rate)
+    if tokens < 1 then
+        wait = math.max(wait, (1 - tokens) / rate)
+    end
+    states[i] = {tokens, capacity, rate}
+end
+if wait > 0 then
+    return tostring(wait)
+end
+for i, key in ipairs(KEYS) do
+    local tokens, capacity, rate = states[i][1], states[i][2], states[i][3]
+    redis.call('HSET', key, 'tokens', tokens - 1, 'ts', now)
+    redis.call('PEXPIRE', key, math.ceil(capacity / rate * 1000))
+end
+return '0'
+"""
+
+_script = None
+
+
+def get_script():
+    global _script
+    if _script is None:
+        _script = get_client().register_script(TOKEN_BUCKET_LUA)
+    return _script
+
+
+def trusted_networks():
+    return [ipaddress.ip_network(net, strict=False) for net in settings.TRUSTED_PROXIES]
+
+
+def is_trusted_proxy(address, networks):
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in net for net in networks)
+
+
+def client_ip(request):
+    """Адрес посетителя.
+
+    Цепочка — X-Forwarded-For и REMOTE_ADDR; идём справа налево, пока адрес
+    принадлежит доверенному прокси (TRUSTED_PROXIES). Левую часть заголовка
+    может прислать сам клиент, поэтому дальше первого недоверенного адреса
+    не смотрим. Без доверенного прокси — просто REMOTE_ADDR.
+    """
+    remote_addr = request.META.get("REMOTE_ADDR", "")
+    networks = trusted_networks()
+    if not is_trusted_proxy(remote_addr, networks):
+        return remote_addr
+    forwarded = [hop.strip() for hop in request.META.get("HTTP_X_FORWARDED_FOR", "").split(",") if hop.strip()]
+    address = remote_addr
+    for hop in reversed(forwarded):
+        address = hop
+        if not is_trusted_proxy(hop, networks):
+            break
+    return address
+
+
+def limit_group(source):
+    """Источник из настроек или "default".
+
+    source присылает клиент: для незнакомых значений ведро общее, иначе
+    сменой source лимит обходился бы.
+    """
+    return source if source in settings.LEAD_RATE_LIMITS else "default"
+
+
+def buckets(group, ip, data):
+    """[(ключ, ёмкость, токенов в секунду)] для заявки."""
+    limits = settings.LEAD_RATE_LIMITS[group]
+    values = {
+        "ip": ip,
+        "phone": normalize_phone(data.get("phone")),
+        "email": normalize_email(data.get("email")),
+    }
+    result = []
+    for kind, value in values.items():
+        if not value or kind not in limits:
+            continue
+        capacity, period = limits[kind]
+        digest = hashlib.sha1(value.encode()).hexdigest()
+        result.append((BUCKET_KEY.format(group=group, kind=kind, value=digest), capacity, capacity / period))
+    return result
+
+
+def record(outcome, group):
+    try:
+        get_client().hincrby(METRICS_KEY, f"{outcome}:{group}", 1)
+    except redis.RedisError:
+        pass
+
+
+def check_lead(request, data):
+    """(результат, секунд до повтора) для проверенной формы заявки."""
+    source = data.get("source") or "website"
+    group = limit_group(source)
+    if not settings.LEADS_REDIS_URL:
+        return ALLOWED, 0
+
+    try:
+        fingerprint = json.dumps(
+            [source, data.get("name", ""), normalize_phone(data.get("phone")),
+             normalize_email(data.get("email")), data.get("telegram", ""), data.get("message", "")],
+            ensure_ascii=False,
+        )
+        dedup_key = DEDUP_KEY.format(hashlib.sha256(fingerprint.encode()).hexdigest())
+        client = get_client()
+        if client.exists(dedup_key):
+            record(DUPLICATE, group)
+            return DUPLICATE, 0
+
+        items = buckets(group, client_ip(request), data)
+        if items:
+            args = [int(time.time() * 1000)]
+            for _, capacity, rate in items:
+                args += [capacity, rate]
+            wait = float(get_script()(keys=[key for key, _, _ in items], args=args))
+            if wait > 0:
+                record(LIMITED, group)
+                return LIMITED, int(wait) + 1
+
+        # Параллельный повтор, успевший раньше, тоже станет дублем
+        if not client.set(dedup_key, 1, nx=True, ex=settings.LEAD_DEDUP_WINDOW):
+            record(DUPLICATE, group)
+            return DUPLICATE, 0
+    except redis.RedisError:
+        logger.warning("Lead rate limiter unavailable", exc_info=True)
+        return ALLOWED, 0
+
+    record(ALLOWED, group)
+    return ALLOWED, 0
+
+
+def get_metrics():
+    return {
+        key.decode(): int(value)
+        for key, value in sorted(get_client().hgetall(METRICS_KEY).items())
+    }
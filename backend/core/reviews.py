@@ -0,0 +1,112 @@
+"""
+Отзывы, собранные заранее.
+
+Активные видео-отзывы раскладываются по типам курса (с уже подмешанными
+отзывами «Все страницы»), URL обложек и аватаров вычисляются один раз.
+Одно видео, заведённое для нескольких курсов, в списке не повторяется.
+Страница курса берёт свой список по ключу без запросов в базу.
+Пересобирается при сохранении VideoReview или Review (см. signals.py).
+"""
+from dataclasses import dataclass
+
+from .cache import VersionedSnapshot, model_namespace
+from .models import Review, VideoReview
+
+
+@dataclass(frozen=True)
+class VideoReviewCard:
+    id: int
+    user_name: str
+    course_name: str
+    course_type: str
+    youtube_url: str
+    youtube_id: str
+    poster_url: str
+    avatar_url: str
+    poster_variants: dict
+    avatar_variants: dict
+
+
+@dataclass(frozen=True)
+class ReviewCard:
+    id: int
+    user_name: str
+    course_name: str
+    text: str
+    rating: int
+    avatar_url: str
+    avatar_variants: dict
+
+
+@dataclass(frozen=True)
+class ReviewBundle:
+    videos: tuple
+    videos_by_course: dict
+    reviews: tuple
+
+    def videos_for(self, course_type):
+        return self.videos_by_course.get(course_type, self.videos_by_course['all'])
+
+    def latest_reviews(self, limit=10):
+        return self.reviews[:limit]
+
+
+def unique_videos(cards):
+    """Одно и то же видео, заведённое для разных курсов, показываем один раз."""
+    seen = set()
+    result = []
+    for card in cards:
+        if card.youtube_id and card.youtube_id in seen:
+            continue
+        seen.add(card.youtube_id)
+        result.append(card)
+    return tuple(result)
+
+
+def build_review_bundle():
+    all_videos = tuple(
+        VideoReviewCard(
+            id=vr.pk,
+            user_name=vr.user_name,
+            course_name=vr.course_name,
+            course_type=vr.course_type,
+            youtube_url=vr.youtube_url,
+            youtube_id=vr.youtube_id,
+            poster_url=vr.get_poster(),
+            avatar_url=vr.get_avatar(),
+            poster_variants=vr.variants_for('poster'),
+            avatar_variants=vr.variants_for('user_avatar'),
+        )
+        for vr in VideoReview.objects.filter(is_active=True)
+    )
+    videos = unique_videos(all_videos)
+
+    # Отзыв «Все страницы» попадает в список каждого курса, порядок — как в базе
+    videos_by_course = {
+        course_type: unique_videos(v for v in all_videos if v.course_type in (course_type, 'all'))
+        for course_type, _ in VideoReview.COURSE_TYPE_CHOICES
+    }
+
+    reviews = tuple(
+        ReviewCard(
+            id=review.pk,
+            user_name=review.user_name,
+            course_name=review.course_name,
+            text=review.text,
+            rating=review.rating,
+            avatar_url=review.get_avatar(),
+            avatar_variants=review.variants_for('user_avatar'),
+        )
+        for review in Review.objects.filter(is_active=True)
+    )
+    return ReviewBundle(videos=videos, videos_by_course=videos_by_course, reviews=reviews)
+
+
+review_bundle = VersionedSnapshot(
+    (model_namespace(VideoReview), model_namespace(Review)),
+    build_review_bundle,
+)
+
+
+def get_review_bundle():
+    return review_bundle.get()
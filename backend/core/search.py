@@ -0,0 +1,91 @@
+"""
+Поиск в админке и внутренних выборках.
+
+На PostgreSQL — по GIN-индексам pg_trgm (создаются миграциями
+*_trigram_indexes): icontains компилируется в UPPER(col::text) LIKE
+UPPER('%слово%'), индексы построены по этому же выражению, и поиск идёт
+по индексу, а не перебором таблицы. Результаты сортируются по похожести
+(TrigramWordSimilarity).
+На SQLite (USE_SQLITE=1) — обычный icontains без ранжирования.
+
+Бэкенд выбирается по базе, settings.SEARCH_BACKEND задаёт свой
+(путь к классу).
+"""
+from functools import lru_cache, reduce
+from operator import or_
+
+from django.conf import settings
+from django.contrib.admin.views.main import ORDER_VAR
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connections
+from django.db.models import Q
+from django.db.models.functions import Greatest
+from django.utils.module_loading import import_string
+
+RANK_FIELD = "search_rank"
+
+
+class ContainsSearchBackend:
+    """Как стандартный поиск админки: каждое слово — в любом из полей."""
+
+    ranked = False
+
+    def filter(self, queryset, fields, term):
+        for word in term.split():
+            queryset = queryset.filter(reduce(or_, (Q(**{f"{field}__icontains": word}) for field in fields)))
+        return queryset
+
+    def search(self, queryset, fields, term):
+        return self.filter(queryset, fields, term)
+
+
+class TrigramSearchBackend(ContainsSearchBackend):
+    """icontains по триграммным индексам + ранжирование по похожести."""
+
+    ranked = True
+
+    def search(self, queryset, fields, term):
+        queryset = self.filter(queryset, fields, term)
+        similarities = [TrigramWordSimilarity(term, field) for field in fields]
+        rank = similarities[0] if len(similarities) == 1 else Greatest(*similarities)
+        return queryset.annotate(**{RANK_FIELD: rank})
+
+
+def get_search_backend(using="default"):
+    if getattr(settings, "SEARCH_BACKEND", None):
+        return import_string(settings.SEARCH_BACKEND)()
+    if connections[using].vendor == "postgresql":
+        return TrigramSearchBackend()
+    return ContainsSearchBackend()
+
+
+class RankedChangeListMixin:
+    """Результаты поиска — по убыванию ранга, пока не выбрана другая сортировка."""
+
+    def get_ordering(self, request, queryset):
+        if RANK_FIELD in queryset.query.annotations and ORDER_VAR not in self.params:
+            return [f"-{RANK_FIELD}", "-pk"]
+        return super().get_ordering(request, queryset)
+
+
+@lru_cache(maxsize=None)
+def ranked_changelist(changelist_class):
+    return type(f"Ranked{changelist_class.__name__}", (RankedChangeListMixin, changelist_class), {})
+
+
+class SearchAdminMixin:
+    """search_fields через поисковый бэкенд (см. get_search_backend)."""
+
+    def get_search_backend(self):
+        return get_search_backend()
+
+    def get_changelist(self, request, **kwargs):
+        return ranked_changelist(super().get_changelist(request, **kwargs))
+
+    def get_search_results(self, request, queryset, search_term):
+        search_term = search_term.strip()
+        # Префиксы стандартного поиска (^, =, @) здесь не нужны: поиск всегда «содержит»
+        fields = [field.lstrip("^=@") for field in self.get_search_fields(request)]
+        if not search_term or not fields:
+            return queryset, False
+        return self.get_search_backend().search(queryset, fields, search_term), False
@@ -0,0 +1,79 @@
+import logging
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from events.models import Event
+
+from .cache import bump_version_on_commit, model_namespace
+from .chrome import site_chrome
+from .images import pending_variant_fields
+from .models import FAQ, CodeSnippet, Review, SiteSettings, VideoReview, WhySpanishItem
+from .static_export import schedule_export
+from .youtube import needs_mirror
+
+logger = logging.getLogger(__name__)
+
+# Модели, от которых строятся закэшированные страницы (см. page_cache.py)
+PAGE_CONTENT_MODELS = (FAQ, Review, VideoReview, WhySpanishItem, Event)
+# Модели с адаптивными вариантами картинок (см. images.py)
+RESPONSIVE_IMAGE_MODELS = (Review, VideoReview, WhySpanishItem)
+
+
+def invalidate_site_chrome(sender, **kwargs):
+    """Любое изменение в админке сбрасывает снимок во всех воркерах."""
+    site_chrome.invalidate()
+    schedule_export()
+
+
+def invalidate_model_pages(sender, **kwargs):
+    """Сбрасывает страницы, зависящие от изменённой модели."""
+    bump_version_on_commit(model_namespace(sender))
+    schedule_export()
+
+
+def schedule_image_variants(sender, instance, **kwargs):
+    """После загрузки новой картинки нарезать её варианты в фоне."""
+    if not pending_variant_fields(instance):
+        return
+
+    def enqueue():
+        from .tasks import generate_image_variants
+
+        try:
+            generate_image_variants.delay(sender._meta.label, instance.pk)
+        except Exception:
+            # Без брокера страница просто останется с оригиналами
+            logger.exception("Failed to schedule image variants for %s #%s", sender._meta.label, instance.pk)
+
+    transaction.on_commit(enqueue)
+
+
+def schedule_youtube_poster(sender, instance, **kwargs):
+    """Новая ссылка на видео без своей обложки — скачать обложку с YouTube."""
+    if not needs_mirror(instance):
+        return
+
+    def enqueue():
+        from .tasks import mirror_youtube_posters
+
+        try:
+            mirror_youtube_posters.delay([instance.pk])
+        except Exception:
+            logger.exception("Failed to schedule YouTube poster for VideoReview #%s", instance.pk)
+
+    transaction.on_commit(enqueue)
+
+
+for model in (SiteSettings, CodeSnippet):
+    post_save.connect(invalidate_site_chrome, sender=model, dispatch_uid=f"chrome-save-{model.__name__}")
+    post_delete.connect(invalidate_site_chrome, sender=model, dispatch_uid=f"chrome-delete-{model.__name__}")
+
+for model in PAGE_CONTENT_MODELS:
+    post_save.connect(invalidate_model_pages, sender=model, dispatch_uid=f"pages-save-{model.__name__}")
+    post_delete.connect(invalidate_model_pages, sender=model, dispatch_uid=f"pages-delete-{model.__name__}")
+
+for model in RESPONSIVE_IMAGE_MODELS:
+    post_save.connect(schedule_image_variants, sender=model, dispatch_uid=f"variants-save-{model.__name__}")
+
+post_save.connect(schedule_youtube_poster, sender=VideoReview, dispatch_uid="youtube-poster-VideoReview")
@@ -39,4 +39,18 @@ class BlogSitemap(Sitemap):
         return obj.updated_at
 
     def location(self, obj):
-        return obj.get_absolute_url()
\ No newline at end of file
+        return obj.get_absolute_url()
+
+class CourseSitemap(Sitemap):
+    """Sitemap для страниц курсов (из каталога, без запросов в базу)"""
+
+    protocol = "https"
+    changefreq = "weekly"
+    priority = 0.8
+
+    def items(self):
+        from courses.catalog import get_catalog
+        return list(get_catalog())
+
+    def location(self, item):
+        return item.url
@@ -0,0 +1,103 @@
+/*
+ * Страница «мероприятия рядом» (events.views.event_nearby).
+ * Координаты берутся из геолокации браузера, список приходит из
+ * nearby.json (events.views.event_nearby_api) и рисуется той же
+ * разметкой, что и серверный вариант страницы с ?lat=&lng=.
+ */
+(function () {
+    var box = document.querySelector('[data-nearby-events]');
+    if (!box || !window.fetch || !navigator.geolocation) return;
+    // Точка уже в адресе — список отрисован на сервере
+    var params = new URLSearchParams(window.location.search);
+    if (params.has('lat') && params.has('lng')) return;
+
+    var status = box.querySelector('[data-nearby-status]');
+    var results = box.querySelector('[data-nearby-results]');
+
+    function pad(value) {
+        return (value < 10 ? '0' : '') + value;
+    }
+
+    function formatDate(value) {
+        var date = new Date(value);
+        return pad(date.getDate()) + '.' + pad(date.getMonth() + 1) + '.' + date.getFullYear() +
+            ' в ' + pad(date.getHours()) + ':' + pad(date.getMinutes());
+    }
+
+    function element(tag, className, text) {
+        var node = document.createElement(tag);
+        if (className) node.className = className;
+        if (text) node.textContent = text;
+        return node;
+    }
+
+    function renderEvent(event) {
+        var column = element('div', 'col-lg-6 mb_30');
+        var item = element('div', 'career-item');
+        var content = element('div', 'content');
+        var heading = element('div', 'heading');
+
+        var title = element('div', 'text-title fw-6 mb_8 text_primary-color');
+        var link = element('a', 'link', event.title);
+        link.href = event.url;
+        title.appendChild(link);
+
+        var meta = element('ul', 'd-flex');
+        var place = element('li', 'd-flex align-items-center gap_4 text_secondary-color');
+        place.appendChild(element('i', 'icon-MapPin'));
+        place.appendChild(document.createTextNode(event.location_name + ' · ' + event.distance_km + ' км'));
+        var when = element('li', 'd-flex align-items-center gap_4 text_secondary-color');
+        when.appendChild(element('i', 'icon-CalendarBlank'));
+        when.appendChild(document.createTextNode(formatDate(event.event_date)));
+        meta.appendChild(place);
+        meta.appendChild(when);
+
+        heading.appendChild(title);
+        heading.appendChild(meta);
+        content.appendChild(heading);
+
+        var wrap = element('div', 'wrap-btn');
+        var button = element('a', 'tf-btn btn-border btn-px-28');
+        button.href = event.url;
+        button.appendChild(element('span', 'text-button-small', 'Подробнее'));
+        button.appendChild(element('span', 'bg-effect'));
+        wrap.appendChild(button);
+
+        item.appendChild(content);
+        item.appendChild(wrap);
+        column.appendChild(item);
+        return column;
+    }
+
+    function render(data) {
+        results.textContent = '';
+        if (!data.results.length) {
+            status.textContent = 'Рядом с вами мероприятий пока нет';
+            return;
+        }
+        status.textContent = 'Мероприятия в радиусе ' + data.radius_km + ' км.';
+        data.results.forEach(function (event) {
+            results.appendChild(renderEvent(event));
+        });
+    }
+
+    status.textContent = 'Определяем ваше местоположение…';
+    navigator.geolocation.getCurrentPosition(function (position) {
+        var query = new URLSearchParams({
+            lat: position.coords.latitude.toFixed(6),
+            lng: position.coords.longitude.toFixed(6),
+            radius: box.dataset.radius
+        });
+        fetch(box.dataset.apiUrl + '?' + query.toString(), {headers: {'Accept': 'application/json'}})
+            .then(function (response) {
+                if (!response.ok) throw new Error(response.status);
+                return response.json();
+            })
+            .then(render)
+            .catch(function () {
+                status.textContent = 'Не удалось загрузить мероприятия. Попробуйте обновить страницу.';
+            });
+    }, function () {
+        status.textContent = 'Не удалось определить местоположение: разрешите доступ к геолокации в браузере.';
+    });
+})();
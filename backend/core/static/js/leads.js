@@ -0,0 +1,65 @@
+/*
+ * Отправка заявок без перезагрузки страницы.
+ * Форма с data-lead-form уходит через fetch; сервер отвечает 204 или
+ * JSON с ошибками (core.views.contact_request). Idempotency-Key один
+ * на заполнение формы: повтор после сетевой ошибки не создаст дубль.
+ */
+(function () {
+    function newKey() {
+        if (window.crypto && crypto.randomUUID) return crypto.randomUUID();
+        return Date.now().toString(36) + Math.random().toString(36).slice(2);
+    }
+
+    function showMessage(form, text, isError) {
+        var box = form.querySelector('.lead-form-message');
+        if (!box) {
+            box = document.createElement('p');
+            box.className = 'lead-form-message mt_12';
+            form.appendChild(box);
+        }
+        box.textContent = text;
+        box.style.color = isError ? '#d9534f' : '';
+    }
+
+    document.addEventListener('submit', function (event) {
+        var form = event.target;
+        if (!form.matches('form[data-lead-form]') || !window.fetch) return;
+        event.preventDefault();
+
+        form.dataset.idempotencyKey = form.dataset.idempotencyKey || newKey();
+        var button = form.querySelector('[type="submit"]');
+        if (button) button.disabled = true;
+
+        fetch(form.action, {
+            method: 'POST',
+            body: new FormData(form),
+            credentials: 'same-origin',
+            headers: {
+                'X-Requested-With': 'XMLHttpRequest',
+                'Idempotency-Key': form.dataset.idempotencyKey
+            }
+        }).then(function (response) {
+            if (response.status === 204) {
+                delete form.dataset.idempotencyKey;
+                form.reset();
+                showMessage(form, form.dataset.successText || 'Спасибо! Ваша заявка отправлена.', false);
+                return;
+            }
+            if (response.status === 429) {
+                showMessage(form, 'Слишком много заявок, попробуйте позже.', true);
+                return;
+            }
+            if (response.status === 400) {
+                delete form.dataset.idempotencyKey;
+                showMessage(form, 'Проверьте, пожалуйста, поля формы.', true);
+                return;
+            }
+            throw new Error(response.status);
+        }).catch(function () {
+            // Ключ сохраняется: повторная отправка той же заявки не задвоит её
+            showMessage(form, 'Не удалось отправить заявку, попробуйте ещё раз.', true);
+        }).then(function () {
+            if (button) button.disabled = false;
+        });
+    });
+})();
@@ -0,0 +1,156 @@
+"""
+Выгрузка публичных страниц в готовые HTML-файлы для nginx.
+
+Каждая страница рендерится для каждого языка из settings.LANGUAGES в
+<STATIC_EXPORT_ROOT>/<язык>/<путь>/index.html, рядом — .gz.
+nginx отдаёт их через try_files, не доходя до gunicorn (см. gateway/nginx.conf).
+
+Выгрузка инкрементальная: файл перезаписывается, только если изменился
+его HTML, а страницы, которых больше нет (удалённый курс, мероприятие),
+удаляются.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.test import Client
+from django.urls import reverse
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+SCHEDULED_KEY = "core:static-export:scheduled"
+# Изменения за это время выгружаются одним проходом
+EXPORT_DELAY = 30
+
+STATIC_PAGES = ("index", "reviews", "privacy_policy", "oferta", "free_lesson", "teachers")
+
+CSRF_INPUT_RE = re.compile(r'(name="csrfmiddlewaretoken" value=")[^"]*(")')
+# В статическом файле нет токена конкретного посетителя: берём секрет из его
+# CSRF-cookie, Django принимает и его. Без cookie nginx файл не отдаёт
+CSRF_FILL_SCRIPT = (
+    "<script>(function(){var m=document.cookie.match(/(?:^|; )%s=([^;]+)/);"
+    "if(!m)return;document.querySelectorAll('input[name=\"csrfmiddlewaretoken\"]')"
+    ".forEach(function(i){i.value=decodeURIComponent(m[1]);});})();</script>"
+)
+
+
+def public_paths():
+    """Все публичные страницы core, courses и events."""
+    from courses.catalog import get_catalog
+    from events.models import Event
+
+    paths = [reverse(name) for name in STATIC_PAGES]
+    paths += [course.url for course in get_catalog()]
+    paths.append(reverse("events:list"))
+    paths += [event.get_absolute_url() for event in Event.objects.only("slug")]
+    return paths
+
+
+def prepare_html(content):
+    html = CSRF_INPUT_RE.sub(r"\g<1>\g<2>", content)
+    script = CSRF_FILL_SCRIPT % settings.CSRF_COOKIE_NAME
+    if "</body>" in html:
+        return html.replace("</body>", script + "</body>", 1)
+    return html + script
+
+
+def write_file(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def write_page(target, html):
+    data = html.encode()
+    write_file(target, data)
+    write_file(target.with_name(target.name + ".gz"), gzip.compress(data, compresslevel=9))
+
+
+def remove_page(target):
+    for path in (target, target.with_name(target.name + ".gz")):
+        if path.exists():
+            path.unlink()
+
+
+def site_address():
+    """(хост, https?) из settings.SITE_URL; без него — ImproperlyConfigured.
+
+    Первый из ALLOWED_HOSTS для этого не годится: там может оказаться
+    localhost или IP, и они попадут в canonical и og:url выгруженных страниц.
+    """
+    parts = urlsplit(settings.SITE_URL)
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        raise ImproperlyConfigured("Для выгрузки страниц задайте SITE_URL, например https://example.com")
+    return parts.netloc, parts.scheme == "https"
+
+
+def export_site(root=None, full=False):
+    """Выгрузить все страницы. Возвращает (записано, без изменений, удалено)."""
+    host, secure = site_address()
+    root = Path(root or settings.STATIC_EXPORT_ROOT)
+    manifest_path = root / MANIFEST_NAME
+    manifest = {}
+    if manifest_path.exists() and not full:
+        manifest = json.loads(manifest_path.read_text())
+
+    written = unchanged = 0
+    exported = {}
+    for language, _ in settings.LANGUAGES:
+        client = Client(HTTP_HOST=host, raise_request_exception=False)
+        client.cookies[settings.LANGUAGE_COOKIE_NAME] = language
+        for path in public_paths():
+            response = client.get(path, secure=secure)
+            if response.status_code != 200:
+                logger.warning("Static export skipped %s [%s]: %s", path, language, response.status_code)
+                continue
+
+            name = f"{language}{path}"
+            html = prepare_html(response.content.decode(response.charset))
+            digest = hashlib.sha256(html.encode()).hexdigest()
+            exported[name] = digest
+            if manifest.get(name) == digest:
+                unchanged += 1
+                continue
+            write_page(root / name / "index.html", html)
+            written += 1
+
+    removed = 0
+    for name in set(manifest) - set(exported):
+        remove_page(root / name / "index.html")
+        removed += 1
+
+    write_file(manifest_path, json.dumps(exported, indent=2, sort_keys=True).encode())
+    return written, unchanged, removed
+
+
+def schedule_export():
+    """Поставить повторную выгрузку после изменения контента.
+
+    Несколько сохранений подряд в админке дают одну выгрузку.
+    """
+    if not settings.STATIC_EXPORT_ROOT:
+        return
+
+    def enqueue():
+        from .tasks import export_static_site
+
+        if not cache.add(SCHEDULED_KEY, 1, EXPORT_DELAY * 10):
+            return
+        try:
+            export_static_site.apply_async(countdown=EXPORT_DELAY)
+        except Exception:
+            cache.delete(SCHEDULED_KEY)
+            logger.exception("Failed to schedule static export")
+
+    transaction.on_commit(enqueue)
@@ -0,0 +1,66 @@
+import logging
+
+from celery import shared_task
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(ignore_result=True)
+def export_static_site():
+    """Инкрементальная выгрузка публичных страниц для nginx."""
+    from .static_export import SCHEDULED_KEY, export_site
+
+    # Изменения, пришедшие во время выгрузки, поставят следующую
+    cache.delete(SCHEDULED_KEY)
+    written, unchanged, removed = export_site()
+    logger.info("Static export: %s written, %s unchanged, %s removed", written, unchanged, removed)
+
+
+@shared_task(ignore_result=True, autoretry_for=(OSError,), retry_backoff=True, max_retries=3)
+def generate_image_variants(model_label, pk):
+    """Нарезать WebP/AVIF-варианты для новых картинок объекта."""
+    from django.apps import apps
+
+    from .images import build_variants, pending_variant_fields
+
+    model = apps.get_model(model_label)
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None:
+        return
+
+    fields = pending_variant_fields(instance)
+    if not fields:
+        return
+    variants = dict(instance.image_variants)
+    for field_name in fields:
+        variants[field_name] = build_variants(getattr(instance, field_name))
+    instance.image_variants = variants
+    # Обычный save: сработают сигналы сброса кэша страниц и снимков
+    instance.save(update_fields=["image_variants"])
+    logger.info("Image variants for %s #%s: %s", model_label, pk, ", ".join(fields))
+
+
+@shared_task(ignore_result=True)
+def mirror_youtube_posters(pks=None):
+    """Скачать обложки YouTube для видео-отзывов без своей обложки."""
+    from .models import VideoReview
+    from .youtube import mirror_posters
+
+    queryset = VideoReview.objects.filter(poster="").exclude(youtube_id="")
+    if pks is not None:
+        queryset = queryset.filter(pk__in=pks)
+    saved = mirror_posters(queryset)
+    if saved:
+        logger.info("YouTube posters mirrored: %s", saved)
+
+
+@shared_task(ignore_result=True)
+def dispatch_lead_notifications():
+    """Разослать накопившиеся уведомления о заявках из popup."""
+    from .notifications import SCHEDULED_KEY, dispatch_pending, schedule_dispatch
+
+    cache.delete(SCHEDULED_KEY)
+    retry_in = dispatch_pending()
+    if retry_in is not None:
+        schedule_dispatch(countdown=int(retry_in) + 1)
@@ -0,0 +1,50 @@
+from django import template
+from django.db.models.fields.files import FieldFile
+from django.utils.html import format_html, format_html_join
+
+from core.images import srcset
+
+register = template.Library()
+
+
+@register.simple_tag
+def responsive_img(image, variants=None, alt="", sizes="100vw", width=None, height=None, css_class="", style="", loading="lazy"):
+    """<picture> с AVIF/WebP-вариантами картинки.
+
+        {% responsive_img item.image alt=item.title sizes="(max-width: 768px) 100vw, 690px" %}
+        {% responsive_img vr.poster_url variants=vr.poster_variants %}
+
+    image — поле ImageField (варианты берутся из его объекта) или готовый URL.
+    Пока варианты не нарезаны, выводится обычный <img>.
+    """
+    if isinstance(image, FieldFile):
+        if variants is None and hasattr(image.instance, "variants_for"):
+            variants = image.instance.variants_for(image.field.name)
+        src = image.url if image else ""
+    else:
+        src = image or ""
+    variants = variants or {}
+
+    # Собственный размер картинки резервирует место до загрузки (без скачков вёрстки)
+    width = width or variants.get("width")
+    height = height or variants.get("height")
+    img = format_html(
+        '<img src="{}" alt="{}"{}{}{}{}{}>',
+        src,
+        alt,
+        format_html(' width="{}"', width) if width else "",
+        format_html(' height="{}"', height) if height else "",
+        format_html(' class="{}"', css_class) if css_class else "",
+        format_html(' style="{}"', style) if style else "",
+        format_html(' loading="{}"', loading) if loading else "",
+    )
+
+    # AVIF первым: браузер берёт первый подходящий <source>
+    sources = [(fmt, srcset(variants, fmt)) for fmt in ("avif", "webp") if variants.get(fmt)]
+    if not sources:
+        return img
+    return format_html(
+        "<picture>{}{}</picture>",
+        format_html_join("", '<source type="image/{}" srcset="{}" sizes="{}">', ((fmt, urls, sizes) for fmt, urls in sources)),
+        img,
+    )
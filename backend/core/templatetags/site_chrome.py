@@ -0,0 +1,13 @@
+from django import template
+from django.utils.safestring import mark_safe
+from django.utils.translation import get_language
+
+from core.chrome import render_fragment
+
+register = template.Library()
+
+
+@register.simple_tag
+def chrome_include(template_name):
+    """Как {% include %}, но блок рендерится один раз на язык (см. core/chrome.py)."""
+    return mark_safe(render_fragment(template_name, get_language()))
@@ -0,0 +1,253 @@
+import gzip
+import io
+import json
+import tempfile
+import unittest
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from openpyxl import load_workbook
+
+from core.exports import leads_queryset, safe_cell, write_xlsx
+from core.leads import DEAD_LETTER_KEY, process_batch
+from core.models import FAQ, CodeSnippet, ContactRequest, Review, VideoReview, WhySpanishItem
+from core.page_cache import page_cache_key, page_etag
+from core.ratelimit import buckets, client_ip
+from core.static_export import export_site, remove_page, site_address, write_page
+from courses.models import Course
+from events.geo import bounding_box_q
+from events.models import Event
+
+# Как в проде: nginx на хосте (gateway.txt) -> nginx в docker (gateway/nginx.conf) -> бэкенд
+GATEWAY = {"REMOTE_ADDR": "172.18.0.3"}
+
+
+@override_settings(TRUSTED_PROXIES=["127.0.0.1/32", "172.16.0.0/12"])
+class ClientIpTests(SimpleTestCase):
+    factory = RequestFactory()
+
+    def request(self, **meta):
+        return self.factory.post("/contact-request/", **meta)
+
+    def test_visitor_address_behind_gateway(self):
+        # Хост дописал адрес посетителя, docker-nginx — адрес моста
+        request = self.request(HTTP_X_FORWARDED_FOR="203.0.113.7, 172.18.0.1", HTTP_X_REAL_IP="203.0.113.7", **GATEWAY)
+        self.assertEqual(client_ip(request), "203.0.113.7")
+
+    def test_spoofed_forwarded_for_is_ignored(self):
+        request = self.request(HTTP_X_FORWARDED_FOR="1.2.3.4, 203.0.113.7, 172.18.0.1", **GATEWAY)
+        self.assertEqual(client_ip(request), "203.0.113.7")
+
+    def test_untrusted_peer_uses_remote_addr(self):
+        request = self.request(HTTP_X_FORWARDED_FOR="1.2.3.4", REMOTE_ADDR="198.51.100.9")
+        self.assertEqual(client_ip(request), "198.51.100.9")
+
+    def test_gateway_without_forwarded_for(self):
+        self.assertEqual(client_ip(self.request(**GATEWAY)), "172.18.0.3")
+
+    @override_settings(LEAD_RATE_LIMITS={"default": {"ip": (5, 600)}})
+    def test_visitors_get_separate_ip_buckets(self):
+        first = self.request(HTTP_X_FORWARDED_FOR="203.0.113.7, 172.18.0.1", **GATEWAY)
+        second = self.request(HTTP_X_FORWARDED_FOR="203.0.113.8, 172.18.0.1", **GATEWAY)
+        first_key = buckets("default", client_ip(first), {})[0][0]
+        second_key = buckets("default", client_ip(second), {})[0][0]
+        self.assertNotEqual(first_key, second_key)
+
+
+class SafeCellTests(SimpleTestCase):
+    def test_formula_prefixes_are_escaped(self):
+        for value in ("=HYPERLINK(\"x\")", "+7 916", "-1", "@SUM(A1)", "\tx", "\rx"):
+            self.assertEqual(safe_cell(value), "'" + value)
+
+    def test_plain_values_are_kept(self):
+        self.assertEqual(safe_cell("Анна"), "Анна")
+        self.assertEqual(safe_cell(5), 5)
+
+
+class XlsxExportTests(TestCase):
+    def test_xlsx_contains_escaped_rows(self):
+        ContactRequest.objects.create(name="=cmd|' /C calc'!A0", phone="+7 916 000-00-00", source="test")
+        file = io.BytesIO()
+        write_xlsx(leads_queryset(), file)
+        sheet = load_workbook(file).active
+        row = [cell.value for cell in sheet[2]]
+        self.assertIn("'=cmd|' /C calc'!A0", row)
+        self.assertIn("'+7 916 000-00-00", row)
+
+
+@override_settings(ALLOWED_HOSTS=["espacademia.com", "www.espacademia.com"])
+class PageCacheKeyTests(SimpleTestCase):
+    factory = RequestFactory()
+
+    def test_hosts_do_not_share_pages(self):
+        first = self.factory.get("/courses/", HTTP_HOST="espacademia.com")
+        second = self.factory.get("/courses/", HTTP_HOST="www.espacademia.com")
+        self.assertNotEqual(page_cache_key(first), page_cache_key(second))
+        self.assertNotEqual(page_etag(first, [1]), page_etag(second, [1]))
+
+    def test_unused_query_params_are_ignored(self):
+        plain = self.factory.get("/events/", {"sort": "past"}, HTTP_HOST="espacademia.com")
+        tagged = self.factory.get(
+            "/events/", {"sort": "past", "utm_source": "ya", "gclid": "abc"}, HTTP_HOST="espacademia.com"
+        )
+        params = ("sort", "cursor")
+        self.assertEqual(page_cache_key(plain, params), page_cache_key(tagged, params))
+        self.assertEqual(page_etag(plain, [1], params), page_etag(tagged, [1], params))
+
+    def test_view_params_split_pages(self):
+        past = self.factory.get("/events/", {"sort": "past"}, HTTP_HOST="espacademia.com")
+        upcoming = self.factory.get("/events/", HTTP_HOST="espacademia.com")
+        params = ("sort", "cursor")
+        self.assertNotEqual(page_cache_key(past, params), page_cache_key(upcoming, params))
+        self.assertNotEqual(page_etag(past, [1], params), page_etag(upcoming, [1], params))
+
+
+class StaticExportSiteTests(SimpleTestCase):
+    @override_settings(SITE_URL="")
+    def test_export_requires_site_url(self):
+        with self.assertRaises(ImproperlyConfigured):
+            export_site("/nonexistent")
+
+    @override_settings(SITE_URL="https://www.espacademia.com")
+    def test_site_address(self):
+        self.assertEqual(site_address(), ("www.espacademia.com", True))
+
+    def test_page_is_written_with_gzip_copy(self):
+        with tempfile.TemporaryDirectory() as root:
+            target = Path(root) / "ru" / "reviews" / "index.html"
+            write_page(target, "<html>Отзывы</html>")
+            self.assertEqual(sorted(path.name for path in target.parent.iterdir()), ["index.html", "index.html.gz"])
+            self.assertEqual(gzip.decompress(target.with_name("index.html.gz").read_bytes()).decode(), "<html>Отзывы</html>")
+            remove_page(target)
+            self.assertEqual(list(target.parent.iterdir()), [])
+
+
+class SitemapTests(TestCase):
+    def test_sitemap_lists_courses(self):
+        Course.objects.create(title="Activo", slug="activo", template="pages/course-activo.html", course_type="activo")
+        response = self.client.get("/sitemap.xml")
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "/courses/activo/</loc>")
+
+
+# Строк на таблицу и доля активных: на пустой таблице планировщик честно
+# выбирает перебор, поэтому база заполняется как после нескольких лет работы
+PLAN_ROWS = 5000
+ACTIVE_EVERY = 100
+
+
+@unittest.skipUnless(connection.vendor == "postgresql", "EXPLAIN проверяется на PostgreSQL")
+class PublicQueryPlanTests(TestCase):
+    """Публичные выборки идут по своим индексам, без перебора таблицы."""
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        active = [i % ACTIVE_EVERY == 0 for i in range(PLAN_ROWS)]
+        course_types = [value for value, _ in VideoReview.COURSE_TYPE_CHOICES]
+        FAQ.objects.bulk_create(FAQ(question=f"Вопрос {i}", answer="Ответ", order=i, is_active=a) for i, a in enumerate(active))
+        Review.objects.bulk_create(Review(user_name=f"Студент {i}", text="Отзыв", is_active=a) for i, a in enumerate(active))
+        VideoReview.objects.bulk_create(
+            VideoReview(
+                user_name=f"Студент {i}",
+                course_type=course_types[i % len(course_types)],
+                youtube_url="https://youtu.be/dQw4w9WgXcQ",
+                order=i,
+                is_active=a,
+            )
+            for i, a in enumerate(active)
+        )
+        WhySpanishItem.objects.bulk_create(
+            WhySpanishItem(title=f"Пункт {i}", description="Текст", order=i, is_active=a) for i, a in enumerate(active)
+        )
+        CodeSnippet.objects.bulk_create(CodeSnippet(name=f"Код {i}", code="<script></script>", is_active=a) for i, a in enumerate(active))
+        Course.objects.bulk_create(
+            Course(title=f"Курс {i}", slug=f"course-{i}", template="pages/course-activo.html", course_type="activo", is_active=a)
+            for i, a in enumerate(active)
+        )
+        # Почти все мероприятия — прошедшие, предстоящих единицы
+        Event.objects.bulk_create(
+            Event(
+                title=f"Мероприятие {i}",
+                slug=f"event-{i}",
+                description="<p>Встреча</p>",
+                event_date=now + timedelta(days=i - PLAN_ROWS + PLAN_ROWS // ACTIVE_EVERY),
+                location_name="Бали",
+                latitude=round(-90 + 180 * i / PLAN_ROWS, 6),
+                longitude=round(-180 + 360 * (i * 7919 % PLAN_ROWS) / PLAN_ROWS, 6),
+                status=Event.Status.UPCOMING if a else Event.Status.COMPLETED,
+            )
+            for i, a in enumerate(active)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def public_querysets(self):
+        """(queryset, индекс) — те же выборки, что делают публичные страницы."""
+        return [
+            (FAQ.objects.filter(is_active=True), "faq_active_order_idx"),
+            (VideoReview.objects.filter(is_active=True), "videoreview_active_order_idx"),
+            (VideoReview.objects.filter(is_active=True, course_type="activo"), "videoreview_active_course_idx"),
+            (Review.objects.filter(is_active=True), "review_active_created_idx"),
+            (WhySpanishItem.objects.filter(is_active=True), "whyspanish_active_order_idx"),
+            (CodeSnippet.objects.filter(is_active=True).only("location", "code"), "codesnippet_active_idx"),
+            (Course.objects.filter(is_active=True), "course_active_order_idx"),
+            (Event.objects.filter(status__in=["upcoming", "ongoing"]).order_by("event_date", "pk")[:10], "event_status_date_id_idx"),
+            (Event.objects.filter(status="completed").order_by("-event_date", "-pk")[:10], "event_status_date_id_idx"),
+            (Event.objects.filter(status="upcoming").order_by("event_date")[:2], "event_status_date_id_idx"),
+            (Event.objects.filter(status="upcoming").exclude(pk=0)[:3], "event_status_date_id_idx"),
+            (Event.objects.filter(bounding_box_q(-8.8, 115.1, 25)), "event_geo_idx"),
+        ]
+
+    def test_public_querysets_use_indexes(self):
+        for queryset, index in self.public_querysets():
+            table = queryset.model._meta.db_table
+            with self.subTest(table=table, index=index):
+                plan = queryset.explain()
+                self.assertIn(index, plan)
+                self.assertNotIn(f"Seq Scan on {table}", plan)
+
+
+class LeadConsumerTests(TestCase):
+    lead = {"name": "Анна", "phone": "+7 916 000-00-00", "source": "test", "idempotency_key": "lead-1"}
+
+    def messages(self):
+        broken = dict(self.lead, idempotency_key="lead-2", unknown_field=1)
+        return [
+            (b"1-0", {b"lead": json.dumps(self.lead).encode()}),
+            (b"2-0", {b"lead": b"{not json"}),
+            (b"3-0", {b"lead": json.dumps(broken).encode()}),
+        ]
+
+    def redis_client(self, times_delivered):
+        client = mock.Mock()
+        client.xpending_range.return_value = [{"times_delivered": times_delivered}]
+        return client
+
+    def acked(self, client):
+        return [message_id for call in client.xack.call_args_list for message_id in call.args[2:]]
+
+    def dead(self, client):
+        return [call.args[1][b"lead"] for call in client.xadd.call_args_list if call.args[0] == DEAD_LETTER_KEY]
+
+    def test_bad_message_does_not_block_batch(self):
+        client = self.redis_client(times_delivered=1)
+        with self.assertLogs("core.leads", level="ERROR"):
+            self.assertEqual(process_batch(client, self.messages()), 1)
+        self.assertTrue(ContactRequest.objects.filter(idempotency_key="lead-1").exists())
+        # Неразбираемое — сразу в dead letter, несохранившееся ждёт повтора
+        self.assertEqual(self.dead(client), [b"{not json"])
+        self.assertEqual(sorted(self.acked(client)), [b"1-0", b"2-0"])
+
+    @override_settings(LEADS_MAX_DELIVERIES=5)
+    def test_poison_message_moves_to_dead_letter(self):
+        client = self.redis_client(times_delivered=5)
+        with self.assertLogs("core.leads", level="ERROR"):
+            process_batch(client, self.messages())
+        self.assertEqual(len(self.dead(client)), 2)
+        self.assertEqual(sorted(self.acked(client)), [b"1-0", b"2-0", b"3-0"])
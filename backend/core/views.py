@@ -1,19 +1,34 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
+from django.http import HttpResponse, JsonResponse
 from django.db.models import Count
 from django.db.models import Prefetch
+from django.utils.translation import get_language
+from django.views import defaults
+from django.views.decorators.csrf import requires_csrf_token
 
 from events.models import Event
-from .models import FAQ, Review, SiteSettings, VideoReview, WhySpanishItem
+from .chrome import get_site_chrome
+from .forms import ContactRequestForm
+from .leads import submit_lead
+from .models import FAQ, Review, VideoReview, WhySpanishItem
+from .cache import get_or_fill, get_versions
+from .page_cache import (
+    PAGE_TIMEOUT, cache_public_page, entry_from_response, is_cacheable_request, page_namespaces,
+    response_from_entry,
+)
+from .ratelimit import DUPLICATE, LIMITED, check_lead
+from .reviews import get_review_bundle
 
 from django.views.decorators.http import require_POST
 
 
+@cache_public_page(FAQ, Review, VideoReview, WhySpanishItem, Event, serve_stale=True)
 def index(request):
     """Главная страница."""
     
-    # Настройки сайта
-    settings = SiteSettings.get()
+    # Настройки сайта (из снимка, без запроса в базу)
+    settings = get_site_chrome().settings
 
     why_spanish_items = WhySpanishItem.objects.filter(is_active=True)
 
@@ -23,17 +38,49 @@ def index(request):
     # FAQ
     faqs = FAQ.objects.filter(is_active=True)
 
+    # Отзывы
+    bundle = get_review_bundle()
+
     context = {
         'settings': settings,
         'faqs': faqs,
         'why_spanish_items': why_spanish_items,
-        'video_reviews': VideoReview.objects.filter(is_active=True),
-        'reviews': Review.objects.filter(is_active=True)[:10],
+        'video_reviews': bundle.videos,
+        'reviews': bundle.latest_reviews(),
     }
     
     return render(request, "pages/index.html", context)
 
 
+NOT_FOUND_KEY = "core:page:404:{}"
+
+
+@requires_csrf_token
+def page_not_found(request, exception):
+    """404 для анонимов — из кэша, один экземпляр на язык.
+
+    Страница не зависит от адреса, поэтому перебор несуществующих URL
+    ботами не рендерит шаблон каждый раз. Зависит только от шапки и
+    подвала, их версии и проверяются.
+    """
+    if not is_cacheable_request(request):
+        return defaults.page_not_found(request, exception)
+
+    versions = get_versions(page_namespaces(()))
+    response = None
+
+    def fill():
+        nonlocal response
+        response = defaults.page_not_found(request, exception)
+        return dict(entry_from_response(response), versions=versions)
+
+    entry = get_or_fill(NOT_FOUND_KEY.format(get_language()), fill, versions=versions, timeout=PAGE_TIMEOUT)
+    if response is None:
+        response = response_from_entry(request, entry)
+        response.status_code = 404
+    return response
+
+
 def privacy_policy(request):
     return render(request, 'pages/privacy_policy.html')
 
@@ -46,10 +93,12 @@ def free_lesson(request):
     return render(request, 'pages/free-lesson.html')
 
 
+@cache_public_page(Review, VideoReview)
 def reviews(request):
+    bundle = get_review_bundle()
     return render(request, 'pages/reviews.html', {
-        'video_reviews': VideoReview.objects.filter(is_active=True),
-        'reviews': Review.objects.filter(is_active=True),
+        'video_reviews': bundle.videos,
+        'reviews': bundle.reviews,
     })
 
 
@@ -59,25 +108,32 @@ def teachers(request):
 
 @require_POST
 def contact_request(request):
-    """Обработка формы заявки"""
-    from .models import ContactRequest
-    
-    name = request.POST.get('name', '')
-    phone = request.POST.get('phone', '')
-    email = request.POST.get('email', '')
-    telegram = request.POST.get('telegram', '')
-    message = request.POST.get('message', '')
-    source = request.POST.get('source', 'website')
-    
-    if name:
-        ContactRequest.objects.create(
-            name=name,
-            phone=phone,
-            email=email,
-            telegram=telegram,
-            message=message,
-            source=source,
-        )
+    """Обработка формы заявки.
+
+    AJAX-запрос (см. static/js/leads.js) получает 204 или JSON с ошибками,
+    обычная форма — редирект обратно, как раньше.
+    """
+    form = ContactRequestForm(request.POST)
+    is_ajax = request.headers.get('x-requested-with') == 'XMLHttpRequest'
+
+    if form.is_valid():
+        outcome, retry_after = check_lead(request, form.cleaned_data)
+        if outcome == LIMITED:
+            if is_ajax:
+                response = JsonResponse({'errors': {'__all__': ['Слишком много заявок, попробуйте позже.']}}, status=429)
+                response['Retry-After'] = retry_after
+                return response
+            messages.error(request, 'Слишком много заявок, попробуйте позже.')
+            return redirect(request.META.get('HTTP_REFERER', '/'))
+
+        # Повтор той же заявки не записываем, но отвечаем как обычно
+        if outcome != DUPLICATE:
+            client_key = request.headers.get('Idempotency-Key') or request.POST.get('idempotency_key', '')
+            submit_lead(form.cleaned_data, client_key=client_key[:100])
+        if is_ajax:
+            return HttpResponse(status=204)
         messages.success(request, 'Спасибо! Ваша заявка отправлена.')
-    
+    elif is_ajax:
+        return JsonResponse({'errors': form.errors}, status=400)
+
     return redirect(request.META.get('HTTP_REFERER', '/'))
\ No newline at end of file
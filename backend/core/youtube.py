@@ -0,0 +1,135 @@
+"""
+Локальные копии обложек YouTube для видео-отзывов.
+
+Обложка скачивается один раз, пережимается в WebP и кладётся в media —
+страницы не ходят за картинками на img.youtube.com. Чем скачивать,
+задаёт settings.YOUTUBE_POSTER_FETCHER (в тестах — локальная заглушка):
+функция fetcher(youtube_id) -> bytes, при отсутствии обложки
+бросает PosterNotFound.
+"""
+import io
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import PurePosixPath
+
+import requests
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.utils.module_loading import import_string
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+POSTER_DIR = "video_reviews/youtube"
+POSTER_QUALITY = 80
+FETCH_TIMEOUT = 10
+
+
+class PosterNotFound(Exception):
+    """У видео нет обложки (удалено или закрыто) — повторять бесполезно."""
+
+
+_session = None
+
+
+def get_session():
+    global _session
+    if _session is None:
+        _session = requests.Session()
+    return _session
+
+
+def fetch_poster(youtube_id):
+    """Скачать обложку по settings.YOUTUBE_POSTER_URL."""
+    response = get_session().get(settings.YOUTUBE_POSTER_URL.format(id=youtube_id), timeout=FETCH_TIMEOUT)
+    if response.status_code == 404:
+        raise PosterNotFound(youtube_id)
+    response.raise_for_status()
+    return response.content
+
+
+def fetch_with_retry(youtube_id, fetcher=None):
+    """Скачать обложку, повторяя сетевые ошибки с растущей паузой."""
+    fetcher = fetcher or import_string(settings.YOUTUBE_POSTER_FETCHER)
+    retries = settings.YOUTUBE_POSTER_RETRIES
+    for attempt in range(retries + 1):
+        try:
+            return fetcher(youtube_id)
+        except PosterNotFound:
+            raise
+        except (requests.RequestException, OSError):
+            if attempt == retries:
+                raise
+            time.sleep(settings.YOUTUBE_POSTER_BACKOFF * 2 ** attempt)
+
+
+def to_webp(data):
+    image = Image.open(io.BytesIO(data))
+    image = image.convert("RGB")
+    buffer = io.BytesIO()
+    image.save(buffer, format="WEBP", quality=POSTER_QUALITY)
+    return buffer.getvalue()
+
+
+def poster_name(youtube_id):
+    return f"{POSTER_DIR}/{youtube_id}.webp"
+
+
+def is_mirrored(video_review):
+    """Локальная копия есть и сделана для текущей ссылки на видео."""
+    youtube_id = video_review.youtube_id
+    return bool(
+        youtube_id
+        and video_review.youtube_poster
+        and PurePosixPath(video_review.youtube_poster.name).stem == youtube_id
+    )
+
+
+def needs_mirror(video_review):
+    return not video_review.poster and bool(video_review.youtube_id) and not is_mirrored(video_review)
+
+
+def download(youtube_id):
+    """Скачать и пережать; None, если не удалось (отзыв останется со ссылкой на YouTube)."""
+    try:
+        return to_webp(fetch_with_retry(youtube_id))
+    except PosterNotFound:
+        logger.warning("YouTube poster not found: %s", youtube_id)
+    except Exception:
+        logger.exception("YouTube poster download failed: %s", youtube_id)
+    return None
+
+
+def mirror_posters(video_reviews):
+    """Скачать недостающие обложки, не больше YOUTUBE_POSTER_CONCURRENCY разом.
+
+    Скачивание идёт в потоках, запись в базу — в вызывающем. Возвращает
+    число сохранённых обложек.
+    """
+    pending = {}
+    for video_review in video_reviews:
+        if needs_mirror(video_review):
+            pending.setdefault(video_review.youtube_id, []).append(video_review)
+    if not pending:
+        return 0
+
+    with ThreadPoolExecutor(max_workers=settings.YOUTUBE_POSTER_CONCURRENCY) as pool:
+        results = dict(zip(pending, pool.map(download, pending)))
+
+    saved = 0
+    for youtube_id, data in results.items():
+        if data is None:
+            continue
+        # Одно видео в нескольких отзывах (разные курсы) — один файл
+        first, *rest = pending[youtube_id]
+        name = poster_name(youtube_id)
+        if first.youtube_poster.storage.exists(name):
+            first.youtube_poster.storage.delete(name)
+        first.youtube_poster.save(name.rsplit("/", 1)[1], ContentFile(data), save=False)
+        for video_review in [first, *rest]:
+            video_review.youtube_poster.name = first.youtube_poster.name
+            # Обычный save: сработает сброс кэша отзывов и страниц
+            video_review.save(update_fields=["youtube_poster"])
+            saved += 1
+    return saved
@@ -0,0 +1,11 @@
+from django.contrib import admin
+from .models import Course
+
+
+@admin.register(Course)
+class CourseAdmin(admin.ModelAdmin):
+    list_display = ["title", "slug", "course_type", "order", "is_active"]
+    list_filter = ["course_type", "is_active"]
+    list_editable = ["order", "is_active"]
+    search_fields = ["title", "slug"]
+    prepopulated_fields = {"slug": ("title",)}
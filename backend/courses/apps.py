@@ -4,4 +4,7 @@ from django.apps import AppConfig
 class CoursesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'courses'
-    verbose_name = 'Курсы'
\ No newline at end of file
+    verbose_name = 'Курсы'
+
+    def ready(self):
+        from . import signals  # noqa: F401
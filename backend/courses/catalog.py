@@ -0,0 +1,62 @@
+"""
+Каталог курсов.
+
+Активные курсы загружаются одним запросом в неизменяемую структуру,
+которая живёт в памяти процесса до следующего сохранения Course в админке.
+Из неё берутся страница курса, меню и sitemap.
+"""
+from dataclasses import dataclass, field
+
+from django.urls import reverse
+
+from core.cache import VersionedSnapshot, model_namespace
+
+from .models import Course
+
+CATALOG_NAMESPACE = model_namespace(Course)
+
+
+@dataclass(frozen=True)
+class CourseEntry:
+    slug: str
+    title: str
+    footer_title: str
+    template: str
+    course_type: str
+    url: str
+
+
+@dataclass(frozen=True)
+class CourseCatalog:
+    courses: tuple
+    by_slug: dict = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "by_slug", {course.slug: course for course in self.courses})
+
+    def __iter__(self):
+        return iter(self.courses)
+
+    def get(self, slug):
+        return self.by_slug.get(slug)
+
+
+def build_catalog():
+    return CourseCatalog(courses=tuple(
+        CourseEntry(
+            slug=course.slug,
+            title=course.title,
+            footer_title=course.footer_title or course.title,
+            template=course.template,
+            course_type=course.course_type,
+            url=reverse("courses:detail", kwargs={"slug": course.slug}),
+        )
+        for course in Course.objects.filter(is_active=True)
+    ))
+
+
+course_catalog = VersionedSnapshot(CATALOG_NAMESPACE, build_catalog)
+
+
+def get_catalog():
+    return course_catalog.get()
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Course',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200, verbose_name='Название')),
+                ('footer_title', models.CharField(blank=True, help_text='Если пусто — как в меню', max_length=200, verbose_name='Название в footer')),
+                ('slug', models.SlugField(max_length=200, unique=True, verbose_name='URL')),
+                ('template', models.CharField(help_text='Например: pages/course-activo.html', max_length=200, verbose_name='Шаблон')),
+                ('course_type', models.CharField(choices=[('activo', 'Español Activo'), ('intensivo', 'Español Activo Intensivo'), ('club', 'Разговорный клуб'), ('kids', 'Для детей'), ('individual', 'Индивидуальные занятия'), ('dele', 'Подготовка к DELE')], help_text='Какие видео-отзывы показывать', max_length=20, verbose_name='Тип курса')),
+                ('order', models.PositiveIntegerField(default=0, verbose_name='Порядок')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Активен')),
+            ],
+            options={
+                'verbose_name': 'Курс',
+                'verbose_name_plural': 'Курсы',
+                'ordering': ['order', 'pk'],
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+from django.db import migrations
+
+# Курсы, которые раньше были зашиты в courses/urls.py и меню
+COURSES = [
+    ("online-kurs-razgovornogo-ispanskogo-espanol-activo", "Español Activo", "Онлайн курс Español Activo",
+     "pages/course-activo.html", "activo"),
+    ("online-kurs-razgovornogo-ispanskogo-espanol-activo-intensivo", "Español Activo Intensivo", "",
+     "pages/course-activo-intensivo.html", "intensivo"),
+    ("razgovornyj-onlajn-klub-s-nositelem", "Разговорный клуб с носителем", "",
+     "pages/course-club.html", "club"),
+    ("kursy-ispanskogo-yazyka-dlya-detej", "Испанский для детей", "",
+     "pages/course-kids.html", "kids"),
+    ("individualnye-zanyatiya-po-izucheniyu-ispanskogo-yazyka", "Индивидуальные занятия", "",
+     "pages/course-individual.html", "individual"),
+    ("podgotovka-k-ekzamenu-dele", "Подготовка к DELE", "",
+     "pages/course-dele.html", "dele"),
+]
+
+
+def create_courses(apps, schema_editor):
+    Course = apps.get_model("courses", "Course")
+    for order, (slug, title, footer_title, template, course_type) in enumerate(COURSES):
+        Course.objects.get_or_create(slug=slug, defaults={
+            "title": title,
+            "footer_title": footer_title,
+            "template": template,
+            "course_type": course_type,
+            "order": order,
+        })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_courses, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0002_initial_courses'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', 'id'], name='course_active_order_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+from django.db import models
+from django.urls import reverse
+
+from core.models import VideoReview
+
+
+class Course(models.Model):
+    """Курс — страница каталога и пункт меню"""
+    COURSE_TYPE_CHOICES = [choice for choice in VideoReview.COURSE_TYPE_CHOICES if choice[0] != 'all']
+
+    title = models.CharField("Название", max_length=200)
+    footer_title = models.CharField("Название в footer", max_length=200, blank=True, help_text="Если пусто — как в меню")
+    slug = models.SlugField("URL", max_length=200, unique=True)
+    template = models.CharField("Шаблон", max_length=200, help_text="Например: pages/course-activo.html")
+    course_type = models.CharField(
+        "Тип курса", max_length=20, choices=COURSE_TYPE_CHOICES,
+        help_text="Какие видео-отзывы показывать"
+    )
+
+    order = models.PositiveIntegerField("Порядок", default=0)
+    is_active = models.BooleanField("Активен", default=True)
+
+    class Meta:
+        verbose_name = "Курс"
+        verbose_name_plural = "Курсы"
+        ordering = ["order", "pk"]
+        indexes = [
+            models.Index(fields=["order", "id"], condition=models.Q(is_active=True), name="course_active_order_idx"),
+        ]
+
+    def __str__(self):
+        return self.title
+
+    def get_absolute_url(self):
+        return reverse("courses:detail", kwargs={"slug": self.slug})
@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+
+from core.cache import bump_version_on_commit
+from core.static_export import schedule_export
+
+from .catalog import CATALOG_NAMESPACE
+from .models import Course
+
+
+def invalidate_catalog(sender, **kwargs):
+    """Каталог, меню и страницы курсов пересоберутся во всех воркерах."""
+    bump_version_on_commit(CATALOG_NAMESPACE)
+    schedule_export()
+
+
+post_save.connect(invalidate_catalog, sender=Course, dispatch_uid="catalog-save")
+post_delete.connect(invalidate_catalog, sender=Course, dispatch_uid="catalog-delete")
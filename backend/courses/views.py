@@ -1,34 +1,29 @@
+from django.http import Http404
 from django.shortcuts import render
 from core.models import VideoReview, Review
-from django.db.models import Q
+
+from core.page_cache import cache_public_page
+from core.reviews import get_review_bundle
+
+from .catalog import get_catalog
+from .models import Course
 
 
 def get_course_context(course_type):
+    bundle = get_review_bundle()
     return {
-        'video_reviews': VideoReview.objects.filter(is_active=True).filter(Q(course_type=course_type) | Q(course_type='all')),
-        'reviews': Review.objects.filter(is_active=True)[:10],
+        'video_reviews': bundle.videos_for(course_type),
+        'reviews': bundle.latest_reviews(),
     }
 
 
-def espanol_activo(request):
-    return render(request, 'pages/course-activo.html', get_course_context('activo'))
-
-
-def espanol_activo_intensivo(request):
-    return render(request, 'pages/course-activo-intensivo.html', get_course_context('intensivo'))
-
-
-def club_con_nositelem(request):
-    return render(request, 'pages/course-club.html', get_course_context('club'))
-
-
-def kursy_dlya_detej(request):
-    return render(request, 'pages/course-kids.html', get_course_context('kids'))
-
-
-def individualnye_zanyatiya(request):
-    return render(request, 'pages/course-individual.html', get_course_context('individual'))
-
+@cache_public_page(Course, VideoReview, Review, serve_stale=True)
+def course_detail(request, slug):
+    """Страница курса: шаблон и тип отзывов берутся из каталога"""
+    course = get_catalog().get(slug)
+    if course is None:
+        raise Http404
 
-def podgotovka_dele(request):
-    return render(request, 'pages/course-dele.html', get_course_context('dele'))
\ No newline at end of file
+    context = get_course_context(course.course_type)
+    context['course'] = course
+    return render(request, course.template, context)
@@ -1,9 +1,12 @@
 from django.contrib import admin
+
+from core.search import SearchAdminMixin
+
 from .models import Event
 
 
 @admin.register(Event)
-class EventAdmin(admin.ModelAdmin):
+class EventAdmin(SearchAdminMixin, admin.ModelAdmin):
     list_display = ["title", "event_date", "location_name", "status", "is_featured"]
     list_filter = ["status", "is_featured", "event_date"]
     search_fields = ["title", "description", "location_name"]
@@ -0,0 +1,129 @@
+"""
+Мероприятия рядом с точкой — без PostGIS, одинаково на PostgreSQL и SQLite.
+
+1. Прямоугольник вокруг точки по индексу (latitude, longitude) отбирает
+   кандидатов; у линии смены дат прямоугольник делится на два.
+2. Точное расстояние (гаверсинус) считается в Python только для них.
+
+Кандидаты кэшируются на ячейку сетки (координаты, округлённые до
+CELL_PRECISION знаков) и радиус, под версией Event. Прямоугольник ячейки
+берётся с запасом на её размер, так что расстояния для самой точки
+запроса остаются точными.
+"""
+import math
+from dataclasses import dataclass, replace
+
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from core.cache import get_version, model_namespace
+
+from .lifecycle import ACTIVE_STATUSES
+from .models import Event
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.32
+# 2 знака — ячейка около 1 км
+CELL_PRECISION = 2
+CANDIDATES_KEY = "events:nearby:{}:{}:{}:{}"
+CANDIDATES_TIMEOUT = 60 * 60
+
+DEFAULT_RADIUS_KM = 25
+MAX_RADIUS_KM = 200
+MAX_RESULTS = 20
+
+
+@dataclass(frozen=True)
+class NearbyEvent:
+    id: int
+    title: str
+    url: str
+    event_date: str
+    location_name: str
+    latitude: float
+    longitude: float
+    distance_km: float = 0.0
+
+    @property
+    def starts_at(self):
+        # event_date хранится строкой ISO (так его отдаёт nearby.json)
+        return parse_datetime(self.event_date)
+
+
+def haversine(lat1, lng1, lat2, lng2):
+    """Расстояние по поверхности Земли в километрах."""
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box_q(lat, lng, radius_km):
+    """Условие «в прямоугольнике вокруг точки» по индексированным колонкам."""
+    lat_delta = radius_km / KM_PER_DEGREE
+    min_lat, max_lat = max(-90.0, lat - lat_delta), min(90.0, lat + lat_delta)
+    q = Q(latitude__gte=round(min_lat, 6), latitude__lte=round(max_lat, 6))
+
+    # Около полюса круг захватывает все долготы
+    cos_lat = math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+    if cos_lat < 1e-6 or radius_km / (KM_PER_DEGREE * cos_lat) >= 180:
+        return q
+    lng_delta = radius_km / (KM_PER_DEGREE * cos_lat)
+    min_lng, max_lng = lng - lng_delta, lng + lng_delta
+    if min_lng < -180:
+        lng_q = Q(longitude__gte=round(min_lng + 360, 6)) | Q(longitude__lte=round(max_lng, 6))
+    elif max_lng > 180:
+        lng_q = Q(longitude__gte=round(min_lng, 6)) | Q(longitude__lte=round(max_lng - 360, 6))
+    else:
+        lng_q = Q(longitude__gte=round(min_lng, 6), longitude__lte=round(max_lng, 6))
+    return q & lng_q
+
+
+def cell_of(lat, lng):
+    return round(lat, CELL_PRECISION), round(lng, CELL_PRECISION)
+
+
+def find_candidates(lat, lng, radius_km):
+    queryset = (
+        Event.objects.filter(bounding_box_q(lat, lng, radius_km), status__in=ACTIVE_STATUSES)
+        .only("pk", "title", "slug", "event_date", "location_name", "latitude", "longitude")
+    )
+    return [
+        NearbyEvent(
+            id=event.pk,
+            title=event.title,
+            url=event.get_absolute_url(),
+            event_date=event.event_date.isoformat(),
+            location_name=event.location_name,
+            latitude=float(event.latitude),
+            longitude=float(event.longitude),
+        )
+        for event in queryset
+    ]
+
+
+def cell_candidates(lat, lng, radius_km):
+    """Кандидаты для всей ячейки, в которую попала точка."""
+    cell_lat, cell_lng = cell_of(lat, lng)
+    key = CANDIDATES_KEY.format(get_version(model_namespace(Event)), cell_lat, cell_lng, radius_km)
+    candidates = cache.get(key)
+    if candidates is None:
+        # Запас на размер ячейки: точка может лежать в любом её углу
+        margin_km = 10 ** -CELL_PRECISION * KM_PER_DEGREE
+        candidates = find_candidates(cell_lat, cell_lng, radius_km + margin_km)
+        cache.set(key, candidates, CANDIDATES_TIMEOUT)
+    return candidates
+
+
+def nearby_events(lat, lng, radius_km=DEFAULT_RADIUS_KM, limit=MAX_RESULTS):
+    """Мероприятия в радиусе от точки, ближние первыми."""
+    results = []
+    for candidate in cell_candidates(lat, lng, radius_km):
+        distance = haversine(lat, lng, candidate.latitude, candidate.longitude)
+        if distance <= radius_km:
+            results.append((distance, candidate))
+    results.sort(key=lambda item: item[0])
+    return [
+        replace(candidate, distance_km=round(distance, 2))
+        for distance, candidate in results[:limit]
+    ]
@@ -0,0 +1,150 @@
+"""
+Календарь мероприятий в формате iCalendar (RFC 5545).
+
+Блок VEVENT каждого мероприятия кэшируется по (pk, updated_at): после
+правки в админке меняется updated_at, и пересобирается только этот блок.
+Лента собирается из кэша пачками (get_many) и отдаётся потоком.
+
+ETag ленты — из версии Event (см. core/cache.py), без запроса в базу:
+календари, опрашивающие ленту каждые несколько минут, получают 304.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.html import strip_tags
+
+from core.cache import get_version, model_namespace
+
+from .lifecycle import ACTIVE_STATUSES, EVENT_DEFAULT_DURATION
+from .models import Event
+
+VEVENT_KEY = "events:vevent:{}:{}:{}"
+VEVENT_TIMEOUT = 60 * 60 * 24 * 7
+BATCH_SIZE = 200
+PRODID = "-//espacademia//Events//RU"
+CONTENT_TYPE = "text/calendar; charset=utf-8"
+
+
+def escape_text(value):
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold(line):
+    """Строки длиннее 75 байт переносятся с пробелом в начале продолжения."""
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line + "\r\n"
+    parts = []
+    limit = 75
+    while encoded:
+        cut = min(limit, len(encoded))
+        # Не режем многобайтовый символ UTF-8 посередине
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode())
+        encoded = encoded[cut:]
+        limit = 74
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def format_datetime(value):
+    return value.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def render_vevent(event, base_url):
+    end = event.end_date or event.event_date + EVENT_DEFAULT_DURATION
+    description = event.short_description or strip_tags(event.description).strip()
+    location = ", ".join(part for part in (event.location_name, event.address) if part)
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:event-{event.pk}@{base_url.split('://', 1)[-1]}",
+        f"DTSTAMP:{format_datetime(event.updated_at)}",
+        f"LAST-MODIFIED:{format_datetime(event.updated_at)}",
+        f"DTSTART:{format_datetime(event.event_date)}",
+        f"DTEND:{format_datetime(end)}",
+        f"SUMMARY:{escape_text(event.title)}",
+        f"URL:{base_url}{event.get_absolute_url()}",
+    ]
+    if description:
+        lines.append(f"DESCRIPTION:{escape_text(description)}")
+    if location:
+        lines.append(f"LOCATION:{escape_text(location)}")
+    if event.has_map:
+        lines.append(f"GEO:{event.latitude};{event.longitude}")
+    lines.append("END:VEVENT")
+    return "".join(fold(line) for line in lines)
+
+
+def vevent_key(pk, updated_at, base_url):
+    return VEVENT_KEY.format(pk, updated_at.timestamp(), hashlib.md5(base_url.encode()).hexdigest()[:8])
+
+
+def cached_vevents(keys, base_url):
+    """VEVENT для [(pk, updated_at)] в том же порядке; промахи — одним запросом."""
+    cache_keys = [vevent_key(pk, updated_at, base_url) for pk, updated_at in keys]
+    found = cache.get_many(cache_keys)
+    missing = [pk for (pk, _), key in zip(keys, cache_keys) if key not in found]
+    if missing:
+        fresh = {}
+        for event in Event.objects.filter(pk__in=missing):
+            fresh[vevent_key(event.pk, event.updated_at, base_url)] = render_vevent(event, base_url)
+        cache.set_many(fresh, VEVENT_TIMEOUT)
+        found.update(fresh)
+    # Мероприятие могли изменить между запросами — без него, до следующего опроса
+    return [found[key] for key in cache_keys if key in found]
+
+
+def calendar_header(name):
+    return "".join(fold(line) for line in (
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{escape_text(name)}",
+    ))
+
+
+CALENDAR_FOOTER = "END:VCALENDAR\r\n"
+
+
+def iter_feed(base_url, name="Мероприятия"):
+    """Лента предстоящих мероприятий по частям."""
+    yield calendar_header(name)
+    keys = (
+        Event.objects.filter(status__in=ACTIVE_STATUSES)
+        .order_by("event_date", "pk")
+        .values_list("pk", "updated_at")
+    )
+    batch = []
+    for key in keys.iterator(chunk_size=BATCH_SIZE):
+        batch.append(key)
+        if len(batch) == BATCH_SIZE:
+            yield "".join(cached_vevents(batch, base_url))
+            batch = []
+    if batch:
+        yield "".join(cached_vevents(batch, base_url))
+    yield CALENDAR_FOOTER
+
+
+def event_calendar(event, base_url):
+    """Календарь из одного мероприятия."""
+    return calendar_header(event.title) + "".join(cached_vevents([(event.pk, event.updated_at)], base_url)) + CALENDAR_FOOTER
+
+
+def calendar_etag(request):
+    raw = "|".join([
+        request.get_full_path(),
+        request.get_host(),
+        settings.BUILD_HASH,
+        str(get_version(model_namespace(Event))),
+    ])
+    return '"%s"' % hashlib.md5(raw.encode()).hexdigest()
@@ -0,0 +1,46 @@
+"""
+Смена статусов мероприятий по времени.
+
+Статус — единственное, по чему фильтруют публичные страницы: «предстоящие»
+(upcoming и ongoing) и «прошедшие» (completed). Переводит статусы задача
+advance_event_statuses (Celery beat, раз в минуту) двумя UPDATE по индексу
+(status, event_date, id) — без перебора мероприятий в Python.
+
+Мероприятие без end_date считается закончившимся через
+EVENT_DEFAULT_DURATION после начала. UPDATE обходит auto_now, поэтому
+updated_at (ключ кэша VEVENT) выставляется явно. Если статус хоть у одного
+мероприятия сменился, сбрасываются закэшированные страницы Event.
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core.cache import bump_version_on_commit, model_namespace
+from core.static_export import schedule_export
+
+from .models import Event
+
+EVENT_DEFAULT_DURATION = timedelta(hours=3)
+
+ACTIVE_STATUSES = (Event.Status.UPCOMING, Event.Status.ONGOING)
+
+
+def advance_event_statuses(now=None):
+    """Перевести начавшиеся и закончившиеся мероприятия; возвращает (начались, закончились)."""
+    now = now or timezone.now()
+    with transaction.atomic():
+        completed = Event.objects.filter(
+            Q(end_date__lte=now) | Q(end_date__isnull=True, event_date__lte=now - EVENT_DEFAULT_DURATION),
+            status__in=ACTIVE_STATUSES,
+            event_date__lte=now,
+        ).update(status=Event.Status.COMPLETED, updated_at=now)
+        started = Event.objects.filter(
+            status=Event.Status.UPCOMING,
+            event_date__lte=now,
+        ).update(status=Event.Status.ONGOING, updated_at=now)
+        if started or completed:
+            bump_version_on_commit(model_namespace(Event))
+            schedule_export()
+    return started, completed
@@ -0,0 +1,39 @@
+from django.db import migrations
+
+TRIGRAM_INDEXES = [
+    ('events_event', 'title'),
+    ('events_event', 'description'),
+    ('events_event', 'location_name'),
+]
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table, column in TRIGRAM_INDEXES:
+        # icontains на PostgreSQL — UPPER("col"::text) LIKE UPPER(...):
+        # индекс строится по тому же выражению, иначе планировщик его не возьмёт
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {table}_{column}_trgm ON {table} '
+            f'USING gin ((UPPER({column}::text)) gin_trgm_ops)'
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {table}_{column}_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0002_image_variants'),
+        # Расширение pg_trgm создаётся там
+        ('core', '0015_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0003_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['status', 'event_date', 'id'], name='event_status_date_id_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:58
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0006_event_geo_index'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='event',
+            name='image_variants',
+        ),
+    ]
@@ -38,11 +38,24 @@ class Event(models.Model):
     is_featured = models.BooleanField("На главной", default=False)
     
     created_at = models.DateTimeField(auto_now_add=True)
+    # Входит в ключ кэша VEVENT (см. events/ical.py)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = "Мероприятие"
         verbose_name_plural = "Мероприятия"
         ordering = ["-event_date"]
+        indexes = [
+            # Все публичные выборки — по статусу (см. events/lifecycle.py) в порядке
+            # даты; id — для курсора (event_date, id), см. events/pagination.py
+            models.Index(fields=["status", "event_date", "id"], name="event_status_date_id_idx"),
+            # Прямоугольник вокруг точки для «рядом со мной», см. events/geo.py
+            models.Index(
+                fields=["latitude", "longitude"],
+                condition=models.Q(latitude__isnull=False, longitude__isnull=False),
+                name="event_geo_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.title
@@ -0,0 +1,117 @@
+"""
+Постраничный вывод мероприятий по ключу (event_date, id).
+
+Страница выбирается условием «строго после / строго до» последней
+показанной строки, а не OFFSET, и без COUNT(*): глубина страницы не
+влияет на время запроса. «Прошедшие» читаются по индексу
+(status, event_date, id) в обратном порядке; предстоящих немного.
+
+Курсор — непрозрачная строка в ?cursor=: направление и ключ строки на
+границе страницы. Старые ссылки ?page=N переводятся в курсор временным
+редиректом (см. views.event_list).
+"""
+import base64
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+AFTER = "a"
+BEFORE = "b"
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(direction, event):
+    raw = f"{direction}|{event.event_date.isoformat()}|{event.pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(value):
+    try:
+        raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)).decode()
+        direction, event_date, pk = raw.split("|")
+        event_date = parse_datetime(event_date)
+        pk = int(pk)
+    except (ValueError, TypeError):
+        raise InvalidCursor(value)
+    if direction not in (AFTER, BEFORE) or event_date is None:
+        raise InvalidCursor(value)
+    return direction, event_date, pk
+
+
+def after_key(event_date, pk, descending):
+    """Строки, идущие после (event_date, pk) в порядке вывода."""
+    if descending:
+        return Q(event_date__lt=event_date) | Q(event_date=event_date, pk__lt=pk)
+    return Q(event_date__gt=event_date) | Q(event_date=event_date, pk__gt=pk)
+
+
+def before_key(event_date, pk, descending):
+    return after_key(event_date, pk, not descending)
+
+
+class KeysetPage:
+    """Страница с интерфейсом, похожим на django.core.paginator.Page."""
+
+    def __init__(self, object_list, previous_cursor, next_cursor):
+        self.object_list = object_list
+        self.previous_cursor = previous_cursor
+        self.next_cursor = next_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+def paginate(queryset, per_page, cursor=None, descending=False):
+    """Страница queryset по курсору; queryset — без сортировки."""
+    order = ["-event_date", "-pk"] if descending else ["event_date", "pk"]
+    reverse_order = ["event_date", "pk"] if descending else ["-event_date", "-pk"]
+
+    if not cursor:
+        rows = list(queryset.order_by(*order)[:per_page + 1])
+        has_more, has_less = len(rows) > per_page, False
+        rows = rows[:per_page]
+    else:
+        direction, event_date, pk = decode_cursor(cursor)
+        if direction == AFTER:
+            rows = list(queryset.filter(after_key(event_date, pk, descending)).order_by(*order)[:per_page + 1])
+            # Пришли по «дальше» — строка курсора осталась позади
+            has_more, has_less = len(rows) > per_page, True
+            rows = rows[:per_page]
+        else:
+            rows = list(queryset.filter(before_key(event_date, pk, descending)).order_by(*reverse_order)[:per_page + 1])
+            has_more, has_less = True, len(rows) > per_page
+            rows = rows[:per_page][::-1]
+
+    if not rows:
+        return KeysetPage([], None, None)
+    return KeysetPage(
+        rows,
+        previous_cursor=encode_cursor(BEFORE, rows[0]) if has_less else None,
+        next_cursor=encode_cursor(AFTER, rows[-1]) if has_more else None,
+    )
+
+
+def cursor_for_page(queryset, per_page, page_number, descending=False):
+    """Курсор, открывающий страницу page_number; None — первая или её нет."""
+    if page_number <= 1:
+        return None
+    order = ["-event_date", "-pk"] if descending else ["event_date", "pk"]
+    # Последняя строка предыдущей страницы — один OFFSET на старую ссылку
+    last = queryset.order_by(*order).only("event_date")[(page_number - 1) * per_page - 1:(page_number - 1) * per_page]
+    last = next(iter(last), None)
+    return encode_cursor(AFTER, last) if last is not None else None
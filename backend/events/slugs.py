@@ -0,0 +1,38 @@
+"""
+Множество slug существующих мероприятий.
+
+Боты перебирают /events/<что-угодно>/; неизвестный slug отклоняется по
+множеству в памяти процесса, без запроса в базу и без обращения к кэшу
+страниц. Множество — снимок под версией Event (см. core.cache.VersionedSnapshot):
+сохранение или удаление мероприятия меняет версию, и все воркеры
+пересобирают его один раз через общий кэш.
+"""
+from functools import wraps
+
+from django.http import Http404
+
+from core.cache import VersionedSnapshot, model_namespace
+
+from .models import Event
+
+
+def build_slugs():
+    return frozenset(Event.objects.values_list("slug", flat=True))
+
+
+event_slugs = VersionedSnapshot(model_namespace(Event), build_slugs)
+
+
+def is_known_slug(slug):
+    return slug in event_slugs.get()
+
+
+def reject_unknown_slug(view):
+    """404 для slug, которого нет среди мероприятий, до вызова view."""
+    @wraps(view)
+    def wrapper(request, slug, *args, **kwargs):
+        if not is_known_slug(slug):
+            raise Http404("Мероприятие не найдено")
+        return view(request, slug, *args, **kwargs)
+
+    return wrapper
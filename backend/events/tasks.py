@@ -0,0 +1,15 @@
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(ignore_result=True)
+def advance_event_statuses():
+    """Перевести мероприятия в «идёт сейчас» / «завершено» по времени."""
+    from .lifecycle import advance_event_statuses
+
+    started, completed = advance_event_statuses()
+    if started or completed:
+        logger.info("Event statuses: %s started, %s completed", started, completed)
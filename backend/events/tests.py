@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from events.models import Event
+
+
+class EventNearbyTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        Event.objects.create(
+            title="Разговорный клуб",
+            slug="club-bali",
+            description="<p>Встреча</p>",
+            event_date=timezone.now() + timedelta(days=3),
+            location_name="Букит, Бали",
+            latitude="-8.800000",
+            longitude="115.160000",
+        )
+
+    def test_page_without_location(self):
+        response = self.client.get(reverse("events:nearby"))
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "events/event_nearby.html")
+        self.assertContains(response, 'data-api-url="%s"' % reverse("events:nearby_api"))
+        self.assertContains(response, "js/events-nearby.js")
+
+    def test_page_with_location(self):
+        response = self.client.get(reverse("events:nearby"), {"lat": "-8.79", "lng": "115.17"})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Разговорный клуб")
+        self.assertContains(response, reverse("events:detail", args=["club-bali"]))
+
+    def test_page_with_nothing_nearby(self):
+        response = self.client.get(reverse("events:nearby"), {"lat": "55.75", "lng": "37.62"})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Рядом с вами мероприятий пока нет")
+
+    def test_api(self):
+        response = self.client.get(reverse("events:nearby_api"), {"lat": "-8.79", "lng": "115.17"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([event["title"] for event in response.json()["results"]], ["Разговорный клуб"])
+        self.assertEqual(
+            set(response.json()["results"][0]),
+            {"id", "title", "url", "event_date", "location_name", "latitude", "longitude", "distance_km"},
+        )
+
+
+class EventListLegacyPageTests(TestCase):
+    def test_page_number_redirect_is_temporary(self):
+        for day in range(1, 12):
+            Event.objects.create(
+                title=f"Встреча {day}",
+                slug=f"meetup-{day}",
+                description="<p>Встреча</p>",
+                event_date=timezone.now() + timedelta(days=day),
+                location_name="Онлайн",
+            )
+        response = self.client.get(reverse("events:list"), {"page": "2"})
+        self.assertEqual(response.status_code, 302)
+        self.assertIn("cursor=", response["Location"])
@@ -5,5 +5,10 @@ app_name = 'events'
 
 urlpatterns = [
     path('', views.event_list, name='list'),
+    path('feed.ics', views.event_feed, name='feed'),
+    # До маршрута по slug, иначе «nearby» примут за мероприятие
+    path('nearby/', views.event_nearby, name='nearby'),
+    path('nearby.json', views.event_nearby_api, name='nearby_api'),
+    path('<slug:slug>.ics', views.event_ics, name='ics'),
     path('<slug:slug>/', views.event_detail, name='detail'),
 ]
\ No newline at end of file
@@ -1,40 +1,166 @@
-from django.shortcuts import render, get_object_or_404
-from django.core.paginator import Paginator
-from django.utils import timezone
+from dataclasses import asdict
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.shortcuts import redirect, render, get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.urls import reverse
+
+from core.cache import get_version, model_namespace
+from core.page_cache import cache_public_page
+
+from .geo import DEFAULT_RADIUS_KM, MAX_RADIUS_KM, nearby_events
+from .ical import CONTENT_TYPE, calendar_etag, event_calendar, iter_feed
+from .lifecycle import ACTIVE_STATUSES
 from .models import Event
+from .pagination import InvalidCursor, cursor_for_page, paginate
+from .slugs import reject_unknown_slug
+
+EVENTS_PER_PAGE = 9
+TOTAL_KEY = "events:total:{}:{}"
+TOTAL_TIMEOUT = 60 * 5
+
+
+def tab_total(tab, events):
+    """Примерное число мероприятий на вкладке — из кэша, без COUNT на каждую страницу."""
+    key = TOTAL_KEY.format(tab, get_version(model_namespace(Event)))
+    total = cache.get(key)
+    if total is None:
+        total = events.count()
+        cache.set(key, total, TOTAL_TIMEOUT)
+    return total
+
+
+def list_url(active_tab, cursor=None):
+    params = {}
+    if active_tab == 'past':
+        params['sort'] = 'past'
+    if cursor:
+        params['cursor'] = cursor
+    url = reverse('events:list')
+    return f"{url}?{urlencode(params)}" if params else url
 
 
+# Вкладки — по статусу; статусы по времени переводит events.tasks и
+# сбрасывает версию Event, так что страница зависит только от версий
+@cache_public_page(Event, query_params=('sort', 'page', 'cursor'))
 def event_list(request):
     """Список мероприятий"""
     sort = request.GET.get('sort', 'upcoming')
     
-    now = timezone.now()
-    
     if sort == 'past':
         # Прошедшие
-        events = Event.objects.filter(event_date__lt=now).order_by('-event_date')
+        events = Event.objects.filter(status=Event.Status.COMPLETED)
         active_tab = 'past'
     else:
-        # Предстоящие
-        events = Event.objects.filter(event_date__gte=now).order_by('event_date')
+        # Предстоящие и идущие сейчас
+        events = Event.objects.filter(status__in=ACTIVE_STATUSES)
         active_tab = 'upcoming'
-    
-    paginator = Paginator(events, 9)
-    page_obj = paginator.get_page(request.GET.get('page'))
-    
+    descending = active_tab == 'past'
+
+    # Старые ссылки ?page=N — на тот же срез по курсору. Редирект временный:
+    # курсор зависит от текущего набора мероприятий и со временем устаревает
+    page = request.GET.get('page')
+    if page is not None:
+        try:
+            page_number = int(page)
+        except ValueError:
+            page_number = 1
+        cursor = cursor_for_page(events, EVENTS_PER_PAGE, page_number, descending)
+        return redirect(list_url(active_tab, cursor))
+
+    try:
+        page_obj = paginate(events, EVENTS_PER_PAGE, request.GET.get('cursor'), descending)
+    except InvalidCursor:
+        raise Http404("Некорректная ссылка на страницу")
+
     return render(request, 'events/event_list.html', {
         'events': page_obj,
         'page_obj': page_obj,
         'active_tab': active_tab,
+        'total_estimate': tab_total(active_tab, events),
+        'next_url': list_url(active_tab, page_obj.next_cursor) if page_obj.has_next() else None,
+        'previous_url': list_url(active_tab, page_obj.previous_cursor) if page_obj.has_previous() else None,
     })
 
 
+@reject_unknown_slug
+@cache_public_page(Event)
 def event_detail(request, slug):
     """Детальная страница мероприятия"""
     event = get_object_or_404(Event, slug=slug)
-    related = Event.objects.filter(status='upcoming').exclude(pk=event.pk)[:3]
+    related = Event.objects.filter(status=Event.Status.UPCOMING).exclude(pk=event.pk)[:3]
     
     return render(request, 'events/event_detail.html', {
         'event': event,
         'related_events': related,
-    })
\ No newline at end of file
+        'ics_url': reverse('events:ics', kwargs={'slug': event.slug}),
+    })
+
+
+def base_url(request):
+    return f"{request.scheme}://{request.get_host()}"
+
+
+def event_feed(request):
+    """Предстоящие мероприятия в iCalendar — для календарей и партнёров."""
+    etag = calendar_etag(request)
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+    response = StreamingHttpResponse(iter_feed(base_url(request)), content_type=CONTENT_TYPE)
+    response["ETag"] = etag
+    return response
+
+
+@reject_unknown_slug
+def event_ics(request, slug):
+    """Одно мероприятие в iCalendar — «добавить в календарь»."""
+    etag = calendar_etag(request)
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+    event = get_object_or_404(Event, slug=slug)
+    response = HttpResponse(event_calendar(event, base_url(request)), content_type=CONTENT_TYPE)
+    response["Content-Disposition"] = f'attachment; filename="{slug}.ics"'
+    response["ETag"] = etag
+    return response
+
+
+def parse_location(params):
+    """(широта, долгота, радиус в км) из ?lat=&lng=&radius= или ValueError."""
+    lat = float(params["lat"])
+    lng = float(params["lng"])
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        raise ValueError("coordinates out of range")
+    # Целые километры: радиус входит в ключ кэша
+    radius = int(params.get("radius") or DEFAULT_RADIUS_KM)
+    return lat, lng, min(max(radius, 1), MAX_RADIUS_KM)
+
+
+def event_nearby_api(request):
+    """Предстоящие мероприятия рядом с точкой, JSON."""
+    try:
+        lat, lng, radius = parse_location(request.GET)
+    except (KeyError, ValueError):
+        return JsonResponse({"error": "Укажите lat и lng"}, status=400)
+    return JsonResponse({
+        "radius_km": radius,
+        "results": [asdict(event) for event in nearby_events(lat, lng, radius)],
+    })
+
+
+def event_nearby(request):
+    """Страница «мероприятия рядом»: точку присылает браузер (геолокация)."""
+    try:
+        lat, lng, radius = parse_location(request.GET)
+    except (KeyError, ValueError):
+        events, radius = None, DEFAULT_RADIUS_KM
+    else:
+        events = nearby_events(lat, lng, radius)
+    return render(request, 'events/event_nearby.html', {
+        'events': events,
+        'radius_km': radius,
+        'api_url': reverse('events:nearby_api'),
+    })